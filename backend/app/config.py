@@ -1,10 +1,94 @@
+import os
+from typing import Literal
+
 from pydantic_settings import BaseSettings
 
+HistoryStrategy = Literal["full", "window", "summary"]
+
+
+def _default_password_hash_workers() -> int:
+    """One process per spare core, but only when at least two cores are spare."""
+    spare = (os.cpu_count() or 1) - 1
+    return spare if spare >= 2 else 0
+
+
 class Settings(BaseSettings):
     anthropic_api_key: str = ""
     openai_api_key: str = ""
     use_mock_services: bool = True
     max_daily_requests: int = 50
+
+    # Add the development users and vocabulary on startup if the tables are empty
+    seed_on_startup: bool = False
+
+    # Shared HTTP pools for the Anthropic/OpenAI clients
+    provider_max_connections: int = 100
+    provider_max_keepalive_connections: int = 20
+    provider_timeout_seconds: float = 60.0
+
+    # Background session scoring
+    scoring_workers: int = 4
+    scoring_max_attempts: int = 3
+    scoring_retry_backoff_seconds: float = 2.0
+    # A running job not updated for this long is presumed dead and may be claimed again;
+    # keep it above the slowest scoring call plus the longest retry backoff
+    scoring_job_lease_seconds: float = 300.0
+    # How often workers look for queued jobs and expired leases to pick up
+    scoring_sweep_interval_seconds: float = 60.0
+    scoring_push_timeout_seconds: float = 90.0
+
+    # Write-behind buffering of conversation turns
+    turn_flush_size: int = 8
+    turn_flush_interval_seconds: float = 2.0
+
+    # TTS audio cache; set tts_cache_dir to "" to keep it in memory only
+    tts_cache_enabled: bool = True
+    tts_cache_memory_max_bytes: int = 32 * 1024 * 1024
+    tts_cache_dir: str = ".tts_cache"
+    tts_cache_disk_max_bytes: int = 512 * 1024 * 1024
+
+    # Conversation context sent to the LLM each turn.
+    # history_strategy: "full", "window" (last N messages) or "summary" (window plus a rolling summary).
+    # The default sends only the last history_max_messages, not the whole session as before;
+    # set "full" for the old behaviour
+    prompt_caching_enabled: bool = True
+    history_strategy: HistoryStrategy = "window"
+    history_max_messages: int = 12
+
+    # bcrypt cost for new hashes; existing hashes are rehashed on login when it changes.
+    # Hashing runs in a pool of password_hash_workers processes (0 = default thread pool).
+    # The pool only pays off with cores to spare: on 1-2 CPUs the workers compete with the
+    # event loop and spawning them slows startup, so threads are faster there. The default
+    # uses cpu_count - 1 workers when that is at least 2, and threads otherwise
+    password_hash_rounds: int = 12
+    password_hash_workers: int = _default_password_hash_workers()
+
+    # Authenticated user cache; ttl 0 disables it. Set the URL (redis://...) to share it between workers
+    auth_user_cache_ttl_seconds: float = 60.0
+    auth_user_cache_max_entries: int = 10_000
+    auth_user_cache_url: str = ""
+
+    # List endpoint pagination
+    page_size_default: int = 50
+    page_size_max: int = 200
+
+    # Responses at least this large are compressed (brotli if brotli-asgi is installed, else gzip)
+    compression_minimum_size: int = 1024
+
+    # Students per roster import (CSV or JSON)
+    roster_import_max_rows: int = 2_000
+
+    # Vocabulary CSV uploads
+    vocabulary_import_max_bytes: int = 5 * 1024 * 1024
+    vocabulary_import_max_rows: int = 10_000
+    vocabulary_import_chunk_bytes: int = 64 * 1024
+
+    # Simulated provider latency for the mock services, e.g. "fixed:0.3",
+    # "uniform:0.2,0.6", "normal:0.5,0.1" or "lognormal:-0.7,0.4" (seconds)
+    mock_stt_latency: str = ""
+    mock_llm_latency: str = ""
+    mock_tts_latency: str = ""
+    mock_scoring_latency: str = ""
     
     postgres_user: str = "postgres"
     postgres_password: str = "postgres"
@@ -18,6 +102,15 @@ class Settings(BaseSettings):
     pgchannelbinding: str = "require"
 
     environment_mode: str = "development"
+    # Overrides the URL built from the settings above, e.g. sqlite:///bench.db for offline benchmarks
+    database_url: str = ""
+
+    # Connection pool, per process (ignored for SQLite)
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
 
     jwt_secret: str = "your-super-secret-key-change-in-production"
     jwt_algorithm: str = "HS256"
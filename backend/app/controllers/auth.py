@@ -3,7 +3,8 @@ import secrets
 import hashlib
 
 from fastapi import APIRouter, Depends, HTTPException, status, Response
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..database.database import get_db
 from ..models.user import (
@@ -16,9 +17,11 @@ from ..models.user import (
     ForgotPasswordRequest,
     ResetPasswordRequest,
 )
-from ..utils.password import hash_password, verify_password
+from ..utils.password import needs_rehash
 from ..utils.jwt import create_access_token
 from ..dependencies.auth import get_current_user
+from ..services.password_hasher import password_hasher
+from ..services.user_cache import user_cache
 from ..config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
@@ -35,14 +38,14 @@ def set_token_cookie(response: Response, token: str):
 
 
 @router.post("/signup", response_model=AuthResponse, status_code=status.HTTP_201_CREATED)
-def signup(
+async def signup(
     user_data: UserCreate,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Check if email exists
     statement = select(User).where(User.email == user_data.email)
-    existing_user = db.exec(statement).first()
+    existing_user = (await db.exec(statement)).first()
     
     if existing_user:
         raise HTTPException(
@@ -51,9 +54,12 @@ def signup(
         )
     
     # Create new user
+    # bcrypt is deliberately slow; keep it off the event loop
+    password_hash = await password_hasher.hash(user_data.password)
+
     new_user = User(
         email=user_data.email,
-        password_hash=hash_password(user_data.password),
+        password_hash=password_hash,
         first_name=user_data.first_name,
         last_name=user_data.last_name,
         native_language=user_data.native_language,
@@ -62,8 +68,8 @@ def signup(
     )
     
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.commit()
+    await db.refresh(new_user)
     
     token = create_access_token(new_user.id)
     set_token_cookie(response, token)
@@ -76,22 +82,29 @@ def signup(
 
 
 @router.post("/login", response_model=AuthResponse)
-def login(
+async def login(
     credentials: LoginRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Find user by email
     statement = select(User).where(User.email == credentials.email)
-    user = db.exec(statement).first()
+    user = (await db.exec(statement)).first()
     
     # Check if user exists and password is correct
-    if not user or not verify_password(credentials.password, user.password_hash):
+    if not user or not await password_hasher.verify(credentials.password, user.password_hash):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password"
         )
 
+    # Upgrade the hash to the configured cost while we have the plain password
+    if needs_rehash(user.password_hash):
+        user.password_hash = await password_hasher.hash(credentials.password)
+        db.add(user)
+        await db.commit()
+        await user_cache.invalidate(user.id)
+
     token = create_access_token(user.id)
     set_token_cookie(response, token)
     
@@ -103,7 +116,7 @@ def login(
 
 
 @router.get("/logout", response_model=MessageResponse)
-def logout(response: Response):
+async def logout(response: Response):
     response.delete_cookie(
         key="jwt",
         httponly=True,
@@ -118,17 +131,17 @@ def logout(response: Response):
 
 
 @router.get("/me", response_model=UserResponse)
-def get_me(current_user: User = Depends(get_current_user)):
+async def get_me(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 @router.post("/forgot-password", response_model=MessageResponse)
-def forgot_password(
+async def forgot_password(
     request_data: ForgotPasswordRequest,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     statement = select(User).where(User.email == request_data.email)
-    user = db.exec(statement).first()
+    user = (await db.exec(statement)).first()
     
     if not user:
         return MessageResponse(status="success", message="If that email exists, a reset link has been sent")
@@ -139,7 +152,7 @@ def forgot_password(
     # Save to user
     user.password_reset_token = hashed_token
     user.password_reset_expires = datetime.now(datetime.UTC) + timedelta(hours=1)
-    db.commit()
+    await db.commit()
     
     # TODO: Send email with reset link
     # reset_url = f"{settings.frontend_url}/resetPassword/{reset_token}"
@@ -156,11 +169,11 @@ def forgot_password(
 
 
 @router.post("/reset-password/{token}", response_model=AuthResponse)
-def reset_password(
+async def reset_password(
     token: str,
     request_data: ResetPasswordRequest,
     response: Response,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ):
     # Hash the token to compare with stored hash
     hashed_token = hashlib.sha256(token.encode()).hexdigest()
@@ -169,7 +182,7 @@ def reset_password(
         User.password_reset_token == hashed_token,
         User.password_reset_expires > datetime.now(datetime.UTC)
     )
-    user = db.exec(statement).first()
+    user = (await db.exec(statement)).first()
     
     if not user:
         raise HTTPException(
@@ -178,14 +191,15 @@ def reset_password(
         )
     
     # Update password
-    user.password_hash = hash_password(request_data.password)
+    user.password_hash = await password_hasher.hash(request_data.password)
     user.password_changed_at = datetime.now(datetime.UTC)
     user.password_reset_token = None
     user.password_reset_expires = None
     
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await user_cache.invalidate(user.id)
     
     # Log user in with new token
     jwt_token = create_access_token(user.id)
@@ -1,27 +1,33 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import joinedload, selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from datetime import datetime
-from typing import List, Optional
+from typing import Optional
 from uuid import UUID
 import requests
 from requests.exceptions import HTTPError
 
 from ..database.database import get_db
 from ..models.conversation_session import ConversationSession, SessionStatus, ConversationSessionResponse
-from ..schemas.responses import StudentAssignmentResponse
+from ..schemas.responses import Page, StudentAssignmentResponse
+from ..models.scoring_job import ScoringJob, ScoringJobResponse
+from ..models.exam import Exam
+from ..models.vocabulary import VocabularyList
 from ..models.user import User
 from ..dependencies.auth import get_current_user, require_roles
 from ..config import settings
+from ..utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(prefix="/conversation-sessions", tags=["conversation-sessions"])
 
 @router.post("/${session_id}/start")
-def start_session(
+async def start_session(
     session_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    session = db.get(ConversationSession, session_id)
+    session = await db.get(ConversationSession, session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -35,18 +41,18 @@ def start_session(
     session.status = SessionStatus.in_progress
 
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
 
     return session
 
 @router.post("/${session_id}/complete")
-def complete_session(
+async def complete_session(
     session_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    session = db.get(ConversationSession, session_id)
+    session = await db.get(ConversationSession, session_id)
 
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
@@ -61,24 +67,68 @@ def complete_session(
     session.ended_at = datetime.now(datetime.UTC)
 
     db.add(session)
-    db.commit()
-    db.refresh(session)
+    await db.commit()
+    await db.refresh(session)
     
     return session
 
 
-@router.get("/", response_model=List[ConversationSessionResponse])
-def get_all_conversation_sessions(db: Session = Depends(get_db)):
-    statement = select(ConversationSession)
-    conversation_sessions = db.exec(statement).all()
-    return conversation_sessions
+@router.get("/", response_model=Page[ConversationSessionResponse])
+async def get_all_conversation_sessions(
+    session_status: Optional[SessionStatus] = Query(None, alias="status"),
+    exam_id: Optional[UUID] = None,
+    student_id: Optional[UUID] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db)
+):
+    statement = select(ConversationSession).options(joinedload(ConversationSession.session_score))
+    if session_status:
+        statement = statement.where(ConversationSession.status == session_status)
+    if exam_id:
+        statement = statement.where(ConversationSession.exam_id == exam_id)
+    if student_id:
+        statement = statement.where(ConversationSession.student_id == student_id)
+
+    return await paginate(db, statement, ConversationSession, page)
+
+@router.get("/{session_id}/scoring", response_model=ScoringJobResponse)
+async def get_scoring_job(
+    session_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    session = await db.get(ConversationSession, session_id, options=[selectinload(ConversationSession.exam)])
+
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    is_exam_teacher = session.exam is not None and session.exam.created_by_id == current_user.id
+    if session.student_id != current_user.id and not is_exam_teacher:
+        raise HTTPException(status_code=403, detail="You do not have access to this session")
+
+    statement = select(ScoringJob).where(ScoringJob.session_id == session_id)
+    job = (await db.exec(statement)).first()
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Session has not been queued for scoring")
+
+    return job
 
 @router.get("/{session_id}", response_model=StudentAssignmentResponse)
-def get_exam(
+async def get_exam(
     session_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
-    conversation_session = db.get(ConversationSession, session_id)
+    conversation_session = await db.get(
+        ConversationSession,
+        session_id,
+        options=[
+            selectinload(ConversationSession.exam)
+            .selectinload(Exam.vocabulary_list)
+            .selectinload(VocabularyList.items),
+            joinedload(ConversationSession.session_score),
+        ]
+    )
     
     if not conversation_session:
         raise HTTPException(status_code=404, detail="Exam not found")
@@ -1,22 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
+from collections import defaultdict
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.orm import defer, joinedload, selectinload
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional
-from uuid import UUID
+from uuid import UUID, uuid4
+from datetime import datetime, timezone
+import csv
+import io
 import json
 
-from ..config import settings
-from ..services.conversation_engine import ConversationEngine
-from ..database.database import get_db
-from ..models.exam import Exam, ExamCreate, ExamResponse, DashboardExamResponse, StudentAssignmentResponse
+from ..services.providers import get_prompt_builder
+from ..services.openings import prepare_exam_opening
+from ..database.database import async_session, dialect_insert, get_db
+from ..models.exam import (
+    Exam, ExamCreate, ExamResponse, ExamSummaryResponse, DashboardExamResponse, StudentAssignmentSummaryResponse
+)
 from ..models.conversation_session import ConversationSession, SessionStatus, SessionAssignment, ConversationSessionResponse
 from ..models.vocabulary import VocabularyList, VocabularyItem, VocabularyListResponse
-from ..schemas.responses import SessionScoreResponse
+from ..models.session_score import SessionScore
+from ..schemas.responses import Page, SessionScoreResponse
 from ..models.user import User
 from ..dependencies.auth import get_current_user, require_roles
+from ..utils.fields import field_selector, sparse_response
+from ..utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(prefix="/exams", tags=["exams"])
 
-conversation_engine = ConversationEngine(settings.anthropic_api_key)
+
+# ExamResponse embeds the vocabulary list and its items; load them up front
+EXAM_RESPONSE_LOADER = selectinload(Exam.vocabulary_list).selectinload(VocabularyList.items)
+
+# ExamSummaryResponse needs neither the prompt nor the items, so don't even read them
+EXAM_SUMMARY_OPTIONS = (defer(Exam.conversation_prompt), selectinload(Exam.vocabulary_list))
 
 def parse_tenses(tenses_json: Optional[str]) -> List[str]:
     if not tenses_json:
@@ -47,19 +66,24 @@ def parse_vocabulary(vocabulary_list: VocabularyList) -> List[str]:
     return formatted
 
 @router.post("/", response_model=ExamResponse, status_code=status.HTTP_201_CREATED)
-def create_exam(
+async def create_exam(
     exam_data: ExamCreate,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher"))
 ):
     """Teacher creates a new exam template."""
 
     # Parse the incoming data for prompt generation
-    vocabulary_list = db.get(VocabularyList, exam_data.vocabulary_list_id)
+    vocabulary_list = None
+    if exam_data.vocabulary_list_id:
+        vocabulary_list = await db.get(
+            VocabularyList, exam_data.vocabulary_list_id, options=[selectinload(VocabularyList.items)]
+        )
     vocab_parsed = parse_vocabulary(vocabulary_list)
     tenses_list = parse_tenses(exam_data.tenses)
     
-    conversation_prompt = conversation_engine.build_system_prompt(
+    conversation_prompt = get_prompt_builder().build_system_prompt(
         target_language=exam_data.target_language,
         student_level=exam_data.difficulty_level,
         vocabulary=vocab_parsed,
@@ -83,35 +107,59 @@ def create_exam(
     ) 
     
     db.add(exam)
-    db.commit()
-    db.refresh(exam)
+    await db.commit()
+    await db.refresh(exam, ["vocabulary_list"])
+
+    # Have the opening ready before the first student starts
+    background_tasks.add_task(prepare_exam_opening, exam.id, exam.conversation_prompt)
     
     return exam
 
 
-@router.get("/", response_model=List[ExamResponse])
-def get_my_exams(
-    db: Session = Depends(get_db),
+@router.get("/", response_model=Page[ExamSummaryResponse])
+async def get_my_exams(
+    target_language: Optional[str] = None,
+    vocabulary_list_id: Optional[UUID] = None,
+    page: PageParams = Depends(page_params),
+    fields: Optional[List[str]] = Depends(field_selector),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher"))
 ):
-    """Get all exams created by this teacher."""
-    
-    statement = select(Exam).where(Exam.created_by_id == current_user.id)
-    exams = db.exec(statement).all()
+    """
+    Get the exams created by this teacher, newest first, one page at a time.
+
+    Exams are summaries; GET /exams/{exam_id} has the prompt and vocabulary.
+    """
     
-    return exams
+    statement = select(Exam).where(Exam.created_by_id == current_user.id).options(*EXAM_SUMMARY_OPTIONS)
+    if target_language:
+        statement = statement.where(Exam.target_language == target_language)
+    if vocabulary_list_id:
+        statement = statement.where(Exam.vocabulary_list_id == vocabulary_list_id)
+
+    return sparse_response(Page[ExamSummaryResponse], await paginate(db, statement, Exam, page), fields)
 
 
 @router.post("/assign", response_model=List[ConversationSessionResponse])
-def assign_exam(
+async def assign_exam(
     assignment: SessionAssignment,
-    db: Session = Depends(get_db),
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher"))
 ):
-    """Assign an exam to one or more students."""
+    """
+    Assign an exam to one or more students, or to all of the teacher's
+    students with assign_all.
+
+    Students who already have a session for this exam are skipped, and only
+    the newly created sessions are returned. The sessions are written with a
+    single INSERT ... ON CONFLICT DO NOTHING RETURNING against the unique
+    (exam_id, student_id) index, so concurrent assigns can't duplicate a
+    session and the query count doesn't grow with the class.
+    """
     
     # Verify exam exists and belongs to this teacher
-    exam = db.get(Exam, assignment.exam_id)
+    exam = await db.get(Exam, assignment.exam_id)
     if not exam or exam.created_by_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -119,86 +167,139 @@ def assign_exam(
         )
     
     # Verify all students belong to this teacher
-    statement = select(User).where(
-        User.id.in_(assignment.student_ids),
-        User.teacher_id == current_user.id
-    )
-    students = db.exec(statement).all()
-    
-    if len(students) != len(assignment.student_ids):
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="One or more students not found or not assigned to you"
-        )
-    
-    # Create a session for each student
+    statement = select(User.id).where(User.teacher_id == current_user.id)
+    if assignment.assign_all:
+        student_ids = set((await db.exec(statement)).all())
+    else:
+        student_ids = set(assignment.student_ids)
+        found = (await db.exec(statement.where(User.id.in_(student_ids)))).all()
+
+        if len(found) != len(student_ids):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="One or more students not found or not assigned to you"
+            )
+
     sessions = []
-    for student_id in assignment.student_ids:
-        session = ConversationSession(
-            exam_id=assignment.exam_id,
-            student_id=student_id,
-            status=SessionStatus.assigned,
-            due_date=assignment.due_date
+    if student_ids:
+        now = datetime.now(timezone.utc)
+        rows = [
+            {
+                "id": uuid4(),
+                "exam_id": exam.id,
+                "student_id": student_id,
+                "status": SessionStatus.assigned,
+                "due_date": assignment.due_date,
+                "created_at": now,
+            }
+            for student_id in student_ids
+        ]
+        # Students who already have this exam hit the unique index and are skipped
+        statement = (
+            dialect_insert(db, ConversationSession)
+            .on_conflict_do_nothing(index_elements=["exam_id", "student_id"])
+            .returning(ConversationSession)
         )
-        db.add(session)
-        sessions.append(session)
-    
-    db.commit()
-    
-    # Refresh all sessions
-    for session in sessions:
-        db.refresh(session)
+        sessions = list(await db.scalars(statement, rows))
+        await db.commit()
+
+        # New sessions have no score; mark it loaded so serializing doesn't query for it
+        for session in sessions:
+            set_committed_value(session, "session_score", None)
+
+    # No-op when the opening already exists, e.g. from create_exam
+    background_tasks.add_task(prepare_exam_opening, exam.id, exam.conversation_prompt)
     
     return sessions
 
 
 @router.get("/dashboard", response_model=List[DashboardExamResponse])
-def teacher_dashboard(
-    db: Session = Depends(get_db),
+async def teacher_dashboard(
+    include_sessions: bool = True,
+    fields: Optional[List[str]] = Depends(field_selector),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher"))
 ):
-    """Get dashboard data for teacher."""
+    """
+    Get dashboard data for teacher.
+
+    Runs a fixed number of queries however many exams and sessions there are.
+    Pass include_sessions=false for just the counts; sessions for one exam
+    are then available from /exams/{exam_id}/scores. Exams are summaries;
+    GET /exams/{exam_id} has the prompt and vocabulary.
+    """
     
-    # Get all exams by this teacher
-    exams_statement = select(Exam).where(Exam.created_by_id == current_user.id)
-    exams = db.exec(exams_statement).all()
+    exams_statement = select(Exam).where(Exam.created_by_id == current_user.id).options(*EXAM_SUMMARY_OPTIONS)
+    exams = (await db.exec(exams_statement)).all()
+
+    # Status counts for every exam in one GROUP BY
+    counts_statement = (
+        select(ConversationSession.exam_id, ConversationSession.status, func.count())
+        .join(Exam, ConversationSession.exam_id == Exam.id)
+        .where(Exam.created_by_id == current_user.id)
+        .group_by(ConversationSession.exam_id, ConversationSession.status)
+    )
+    counts = defaultdict(dict)
+    for exam_id, session_status, count in (await db.exec(counts_statement)).all():
+        counts[exam_id][session_status] = count
+
+    sessions_by_exam = defaultdict(list)
+    if include_sessions:
+        sessions_statement = (
+            select(ConversationSession)
+            .join(Exam, ConversationSession.exam_id == Exam.id)
+            .where(Exam.created_by_id == current_user.id)
+            .options(joinedload(ConversationSession.session_score))
+        )
+        for session in (await db.exec(sessions_statement)).all():
+            sessions_by_exam[session.exam_id].append(session)
     
     dashboard_data = []
     
     for exam in exams:
-        # Get all sessions for this exam
-        sessions_statement = select(ConversationSession).where(
-            ConversationSession.exam_id == exam.id
-        )
-        sessions = db.exec(sessions_statement).all()
+        exam_counts = counts[exam.id]
         
         dashboard_data.append({
-            "exam": ExamResponse.model_validate(exam) if exam else None,
-            "total_assigned": len(sessions),
-            "pending": len([s for s in sessions if s.status == SessionStatus.assigned]),
-            "in_progress": len([s for s in sessions if s.status == SessionStatus.in_progress]),
-            "completed": len([s for s in sessions if s.status == SessionStatus.completed]),
-            "sessions": sessions,
+            "exam": ExamSummaryResponse.model_validate(exam),
+            "total_assigned": sum(exam_counts.values()),
+            "pending": exam_counts.get(SessionStatus.assigned, 0),
+            "in_progress": exam_counts.get(SessionStatus.in_progress, 0),
+            "completed": exam_counts.get(SessionStatus.completed, 0),
+            "sessions": sessions_by_exam[exam.id],
         })
     
-    return dashboard_data
+    return sparse_response(List[DashboardExamResponse], dashboard_data, fields)
 
 
-@router.get("/assignments", response_model=List[StudentAssignmentResponse])
-def student_dashboard(
-    db: Session = Depends(get_db),
+@router.get("/assignments", response_model=List[StudentAssignmentSummaryResponse])
+async def student_dashboard(
+    fields: Optional[List[str]] = Depends(field_selector),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
-    assignments_statement = select(ConversationSession).where(ConversationSession.student_id == current_user.id)
-    assignments = db.exec(assignments_statement).all()
+    """
+    Get a student's assignments, in a fixed number of queries.
+
+    Exams are summaries; GET /conversation-sessions/{session_id} has the
+    prompt and vocabulary for one assignment.
+    """
+    assignments_statement = (
+        select(ConversationSession)
+        .where(ConversationSession.student_id == current_user.id)
+        .options(
+            selectinload(ConversationSession.exam).options(*EXAM_SUMMARY_OPTIONS),
+            joinedload(ConversationSession.session_score),
+        )
+    )
+    assignments = (await db.exec(assignments_statement)).all()
     results = []
 
     for session in assignments:
-        exam = db.get(Exam, session.exam_id) if session.exam_id else None
+        exam = session.exam
 
         exam_summary = None
         if exam:
-            exam_summary = ExamResponse.model_validate(exam)
+            exam_summary = ExamSummaryResponse.model_validate(exam)
 
         session_score = session.session_score
         score_summary = None
@@ -206,7 +307,7 @@ def student_dashboard(
         if session_score:
             score_summary = SessionScoreResponse.model_validate(session_score)
 
-        results.append(StudentAssignmentResponse(
+        results.append(StudentAssignmentSummaryResponse(
             id=session.id,
             status=session.status,
             due_date=session.due_date,
@@ -218,31 +319,91 @@ def student_dashboard(
             session_score=score_summary
         ))
 
-    return results
+    return sparse_response(List[StudentAssignmentSummaryResponse], results, fields)
+
+SCORES_CSV_COLUMNS = [
+    "session_id",
+    "student_name",
+    "status",
+    "completed_at",
+    "overall_score",
+    "vocabulary_usage_score",
+    "grammar_accuracy_score",
+    "verb_tense_accuracy_score",
+    "fluency_score",
+]
+
+
+def exam_scores_statement(exam_id: UUID):
+    """Sessions of an exam with student name and score, in one joined query."""
+    return (
+        select(ConversationSession, User.first_name, User.last_name, SessionScore)
+        .outerjoin(User, ConversationSession.student_id == User.id)
+        .outerjoin(SessionScore, SessionScore.session_id == ConversationSession.id)
+        .where(ConversationSession.exam_id == exam_id)
+        .order_by(User.last_name, User.first_name)
+    )
+
+
+def student_name(first_name: Optional[str], last_name: Optional[str]) -> str:
+    return f"{first_name} {last_name}" if first_name is not None else "Unknown"
+
+
+async def stream_exam_scores_csv(exam_id: UUID, batch_size: int = 500):
+    """Yield the score report as CSV, a batch of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(SCORES_CSV_COLUMNS)
+
+    # Own session: the request's session is closed once the handler returns
+    async with async_session() as db:
+        statement = exam_scores_statement(exam_id).execution_options(yield_per=batch_size)
+        result = await db.stream(statement)
+        async for partition in result.partitions():
+            for session, first_name, last_name, score in partition:
+                writer.writerow([
+                    session.id,
+                    student_name(first_name, last_name),
+                    session.status.value,
+                    session.ended_at.isoformat() if session.ended_at else "",
+                    score.overall_score if score else "",
+                    score.vocabulary_usage_score if score else "",
+                    score.grammar_accuracy_score if score else "",
+                    score.verb_tense_accuracy_score if score else "",
+                    score.fluency_score if score else "",
+                ])
+
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
+
 
 @router.get("/{exam_id}/scores")
-def get_exam_scores(
+async def get_exam_scores(
         exam_id: UUID,
-        db: Session = Depends(get_db),
+        response_format: str = Query("json", alias="format", pattern="^(json|csv)$"),
+        db: AsyncSession = Depends(get_db),
         current_user: User = Depends(require_roles("teacher"))
 ):
-    exam = db.get(Exam, exam_id)
+    exam = await db.get(Exam, exam_id, options=[EXAM_RESPONSE_LOADER])
     if not exam or exam.created_by_id != current_user.id:
         raise HTTPException(status_code=404, detail="Exam not found")
-    
-    statement = select(ConversationSession).where(
-        ConversationSession.exam_id == exam_id
-    )
-    sessions = db.exec(statement).all()
 
+    if response_format == "csv":
+        return StreamingResponse(
+            stream_exam_scores_csv(exam_id),
+            media_type="text/csv",
+            headers={"Content-Disposition": f'attachment; filename="exam-{exam_id}-scores.csv"'}
+        )
+    
     results = []
-    for session in sessions:
-        student = db.get(User, session.student_id)
-        score = session.session_score
-
+    for session, first_name, last_name, score in (await db.exec(exam_scores_statement(exam_id))).all():
         results.append({
             "session_id": session.id,
-            "student_name": f"{student.first_name} {student.last_name}" if student else "Unknown",
+            "student_name": student_name(first_name, last_name),
             "status": session.status,
             "completed_at": session.ended_at,
             "score": SessionScoreResponse.model_validate(score) if score else None
@@ -252,4 +413,26 @@ def get_exam_scores(
         "exam": ExamResponse.model_validate(exam),
         "sessions": results
     }
-    
\ No newline at end of file
+
+
+@router.get("/{exam_id}", response_model=ExamResponse)
+async def get_exam(
+    exam_id: UUID,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Full exam, with the conversation prompt and vocabulary the list views leave out."""
+    exam = await db.get(Exam, exam_id, options=[EXAM_RESPONSE_LOADER])
+    if not exam:
+        raise HTTPException(status_code=404, detail="Exam not found")
+
+    if exam.created_by_id != current_user.id:
+        assigned = (await db.exec(
+            select(ConversationSession.id)
+            .where(ConversationSession.exam_id == exam_id, ConversationSession.student_id == current_user.id)
+            .limit(1)
+        )).first()
+        if not assigned:
+            raise HTTPException(status_code=404, detail="Exam not found")
+
+    return exam
@@ -1,18 +1,18 @@
 import requests
 from requests.exceptions import HTTPError
+from sqlalchemy import insert, update
 from fastapi import APIRouter, Depends, HTTPException
-from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
 from pydantic import BaseModel
 from typing import Optional, List
-from uuid import UUID
+from uuid import UUID, uuid4
 from datetime import datetime, timezone
-from openai import OpenAI
 
 from ..database.database import get_db
-from ..config import settings
+from ..services.clients import provider_clients
 from ..models.conversation_turn import ConversationTurn, ConversationTurnCreate
 from ..models.conversation_session import ConversationSession, SessionStatus
-from ..utils.score_session import generate_session_score
+from ..services.scoring_queue import scoring_queue
 
 router = APIRouter(prefix="/realtime", tags=["realtime"])
 
@@ -20,12 +20,12 @@ class TokenRequest(BaseModel):
     instructions: Optional[str] = None
 
 @router.post("/token")
-def get_ephemeral_token(request: TokenRequest):
+async def get_ephemeral_token(request: TokenRequest):
     """
     Retrieves an OpenAI ephemeral token to create a realtime session
     """
     try:
-        client = OpenAI(api_key=settings.openai_api_key)
+        client = provider_clients.openai
         session_config = {
             "type": "realtime",
             "model": "gpt-realtime",
@@ -55,7 +55,7 @@ def get_ephemeral_token(request: TokenRequest):
             "instructions": request.instructions,
         }
 
-        client_secret_response = client.realtime.client_secrets.create(session=session_config)
+        client_secret_response = await client.realtime.client_secrets.create(session=session_config)
 
         return client_secret_response.model_dump()
     
@@ -85,46 +85,63 @@ class GradeRequest(BaseModel):
 
 class GradeResponse(BaseModel):
     status: str
+    scoring: Optional[str] = None
+
+def parse_timestamp(value: str) -> datetime:
+    # Browsers send ISO strings with a trailing Z, which fromisoformat rejects before 3.11
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+    return datetime.fromisoformat(value)
+
 
 @router.post("/grade")
-def grade_session(request: GradeRequest, db: Session = Depends(get_db)):
-    if request.session_id:
-        session = db.get(ConversationSession, UUID(request.session_id))
-        turns = 0
-        if session:
-            # 1. Save all turns
-            for turn in request.conversation_history:
-                # Handle date cleaning
-                cleaned_timestamp = turn.timestamp
-                if turn.timestamp.endswith('Z'):
-                    cleaned_timestamp = cleaned_timestamp.replace('Z', '+00:00')
-                python_datetime_object = datetime.fromisoformat(cleaned_timestamp)
-                
-                turns += 1
-                new_turn = ConversationTurn(
-                    session_id=session.id,
-                    timestamp=python_datetime_object,
-                    speaker= turn.speaker,
-                    transcript=turn.transcript,
-                    turn_number = turns
-                )
-                db.add(new_turn)
-                db.commit()
-
-            # 2. Mark session as completed
-            session.status = SessionStatus.completed
-            session.ended_at = datetime.now(timezone.utc)
-            db.add(session)
-            db.commit()
-
-            print(f"Session {request.session_id} ended with {turns} turns")
-
-            # 3. Grade session
-            generate_session_score(conversation_session_id=request.session_id)
-
-        
-        return GradeResponse(status="success")
+async def grade_session(request: GradeRequest, db: AsyncSession = Depends(get_db)):
+    """
+    Save the transcript of a realtime session and queue it for scoring.
 
+    The turns are written with one bulk insert in the same transaction that
+    marks the session completed. Completing the session is a conditional
+    UPDATE, so only the first of several retried requests inserts turns; the
+    others just get the existing scoring job back.
+    """
+    if not request.session_id:
+        return GradeResponse(status="success")
 
+    session_id = UUID(request.session_id)
+    if not await db.get(ConversationSession, session_id):
+        return GradeResponse(status="success")
 
-    
\ No newline at end of file
+    try:
+        timestamps = [parse_timestamp(turn.timestamp) for turn in request.conversation_history]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=f"Invalid turn timestamp: {e}")
+
+    # 1. Mark the session completed, unless a previous request already did
+    claimed = (await db.execute(
+        update(ConversationSession)
+        .where(ConversationSession.id == session_id, ConversationSession.status != SessionStatus.completed)
+        .values(status=SessionStatus.completed, ended_at=datetime.now(timezone.utc))
+    )).rowcount
+
+    # 2. Save all turns in one statement, committed together with the status change
+    if claimed and request.conversation_history:
+        await db.execute(insert(ConversationTurn), [
+            {
+                "id": uuid4(),
+                "session_id": session_id,
+                "timestamp": timestamp,
+                "speaker": turn.speaker,
+                "transcript": turn.transcript,
+                "turn_number": turn_number,
+            }
+            for turn_number, (turn, timestamp) in enumerate(zip(request.conversation_history, timestamps), start=1)
+        ])
+    await db.commit()
+
+    if claimed:
+        print(f"Session {request.session_id} ended with {len(request.conversation_history)} turns")
+
+    # 3. Queue grading; poll GET /conversation-sessions/{id}/scoring for the result
+    job = await scoring_queue.enqueue(session_id)
+
+    return GradeResponse(status="success", scoring=job.status)
@@ -1,39 +1,92 @@
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile, status
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import List, Optional
 from uuid import UUID
 
 from ..database.database import get_db
-from ..models.user import User, UserUpdate, UserResponse, StudentResponse
+from ..config import settings
+from ..models.user import User, UserUpdate, UserResponse, StudentResponse, RosterImportRequest, RosterImportResponse
 from ..dependencies.auth import get_current_user, require_roles
+from ..schemas.responses import Page
+from ..services.roster_import import import_roster, iter_roster_rows
+from ..services.user_cache import user_cache
+from ..utils.csv_stream import CsvImportError, CsvImportTooLarge
+from ..utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(prefix="/users", tags=["users"])
 
 
-@router.get("/", response_model=List[UserResponse])
-def get_all_users(db: Session = Depends(get_db)):
+@router.get("/", response_model=Page[UserResponse])
+async def get_all_users(
+    role: Optional[str] = None,
+    teacher_id: Optional[UUID] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db)
+):
     statement = select(User)
-    users = db.exec(statement).all()
-    return users
+    if role:
+        statement = statement.where(User.role == role)
+    if teacher_id:
+        statement = statement.where(User.teacher_id == teacher_id)
+
+    return await paginate(db, statement, User, page)
 
 @router.get("/my-students", response_model=List[StudentResponse])
-def get_my_students(
-    db: Session = Depends(get_db),
+async def get_my_students(
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)):
     print("getting students for user:", current_user.id)
     statement = select(User).where(User.teacher_id == current_user.id)
-    students = db.exec(statement).all()
+    students = (await db.exec(statement)).all()
     return students
 
+@router.post("/roster", response_model=RosterImportResponse)
+async def import_roster_json(
+    roster: RosterImportRequest,
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles("teacher"))
+):
+    """
+    Create many students at once and return a result for each row.
+
+    New students get a temporary password in the report unless one is given.
+    """
+    if len(roster.students) > settings.roster_import_max_rows:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"Roster has more than {settings.roster_import_max_rows} students"
+        )
+
+    rows = list(enumerate(roster.students, start=1))
+    return await import_roster(db, current_user, rows)
+
+
+@router.post("/roster/upload", response_model=RosterImportResponse)
+async def import_roster_csv(
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+    current_user: User = Depends(require_roles("teacher"))
+):
+    """Same as POST /users/roster, from a CSV with email, first_name, last_name and optional password columns."""
+    try:
+        rows = [row async for row in iter_roster_rows(file)]
+    except CsvImportTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except CsvImportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    return await import_roster(db, current_user, rows)
+
 # Protected route - must be logged in
 @router.get("/{user_id}", response_model=UserResponse)
-def get_user(
+async def get_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)  # Requires auth
 ):
     statement = select(User).where(User.id == user_id)
-    user = db.exec(statement).first()
+    user = (await db.exec(statement)).first()
     
     if not user:
         raise HTTPException(
@@ -45,16 +98,16 @@ def get_user(
 
 # Protected route - must be logged in
 @router.get("/me", response_model=UserResponse)
-def get_my_profile(current_user: User = Depends(get_current_user)):
+async def get_my_profile(current_user: User = Depends(get_current_user)):
     return current_user
 
 
 
 @router.patch("/{user_id}", response_model=UserResponse)
-def update_user(
+async def update_user(
     user_id: UUID,
     user_data: UserUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
     if current_user.id != user_id and current_user.role != "admin":
@@ -64,7 +117,7 @@ def update_user(
         )
     
     statement = select(User).where(User.id == user_id)
-    user = db.exec(statement).first()
+    user = (await db.exec(statement)).first()
 
     if not user:
         raise HTTPException(
@@ -78,19 +131,20 @@ def update_user(
         setattr(user, field, value)
 
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
+    await user_cache.invalidate(user.id)
 
     return user
 
 # Admin only route
 @router.delete("/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_user(
+async def delete_user(
     user_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("admin"))  # Admin only!
 ):
-    user = select(User).where(User.id == user_id)
+    user = await db.get(User, user_id)
     
     if not user:
         raise HTTPException(
@@ -98,7 +152,8 @@ def delete_user(
             detail=f"User with id {user_id} not found"
         )
     
-    db.delete(user)
-    db.commit()
+    await db.delete(user)
+    await db.commit()
+    await user_cache.invalidate(user_id)
     
     return None
\ No newline at end of file
@@ -1,52 +1,78 @@
 from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, status
-from sqlmodel import Session, select
-from typing import List
-import csv
-import io
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func, insert
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from typing import Optional
+import json
+import uuid
 
-from ..database.database import get_db
-from ..models.vocabulary import VocabularyItem, VocabularyList, VocabularyListCreate, VocabularyListResponse
+from ..database.database import dialect_insert, get_db
+from ..models.vocabulary import VocabularyItem, VocabularyList, VocabularyListItem, VocabularyListCreate, VocabularyListResponse
 from ..models.user import User
 from ..dependencies.auth import get_current_user, require_roles
+from ..schemas.responses import Page
+from ..services.vocabulary_import import iter_vocabulary_rows
+from ..utils.csv_stream import CsvImportError, CsvImportTooLarge
+from ..utils.pagination import PageParams, page_params, paginate
 
 router = APIRouter(prefix="/vocabulary-lists", tags=["vocabulary-lists"])
 
+# Rows per upsert statement; keeps bind parameters well under driver limits
+UPSERT_BATCH_SIZE = 1000
 
-@router.get("/", response_model=List[VocabularyListResponse])
+
+@router.get("/", response_model=Page[VocabularyListResponse])
 async def get_created_lists(
-    db: Session = Depends(get_db),
+    target_language: Optional[str] = None,
+    page: PageParams = Depends(page_params),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher")),
 ):
-    statement = select(VocabularyList).where(VocabularyList.teacher_id == current_user.id)
-    vocab_lists = db.exec(statement).all()
-    
-    return [VocabularyListResponse.model_validate(vl) for vl in vocab_lists]
+    statement = (
+        select(VocabularyList)
+        .where(VocabularyList.teacher_id == current_user.id)
+        .options(selectinload(VocabularyList.items))
+    )
+    if target_language:
+        statement = statement.where(VocabularyList.target_language == target_language)
+
+    return await paginate(db, statement, VocabularyList, page)
 
 
 @router.post("/preview")
 async def preview_vocabulary_upload(
     file: UploadFile = File(...),
+    stream: bool = False,
     current_user: User = Depends(require_roles("teacher"))
 ):
-    """Parse CSV and return items for preview, but don't save anything yet"""
-    contents = await file.read()
-    decoded = contents.decode('utf-8')
-    reader = csv.DictReader(io.StringIO(decoded))
+    """
+    Parse CSV and return items for preview, but don't save anything yet.
+
+    The file is parsed as it is read. With stream=true the preview is sent
+    back as NDJSON, one line per row as it is parsed, so very large lists
+    never have to be held in memory: {"type": "item", "row", "item"},
+    {"type": "error", "row", "message"}, and finally {"type": "summary",
+    "total", "errors"}, or {"type": "error", "message"} if the file had to
+    be rejected part-way.
+    """
+    if stream:
+        return StreamingResponse(stream_preview(file), media_type="application/x-ndjson")
 
     items = []
     errors = []
 
-    for i, row in enumerate(reader):
-        if not row.get('word') or not row.get('translation'):
-            errors.append(f"Row {i+1}: missing required field")
-            continue
-        items.append({
-            "word": row.get('word', '').strip(),
-            "translation": row.get('translation', '').strip(),
-            "part_of_speech": row.get('part_of_speech', '').strip() or None,
-            "example_sentence": row.get('example_sentence', '').strip() or None,
-            "regional_notes": row.get('regional_notes', '').strip() or None,
-        })
+    try:
+        async for row_number, item in iter_vocabulary_rows(file):
+            if item is None:
+                errors.append(f"Row {row_number}: missing required field")
+                continue
+            items.append(item)
+    except CsvImportTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+    except CsvImportError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return {
         "items": items,
@@ -54,12 +80,40 @@ async def preview_vocabulary_upload(
         "errors": errors
     }
 
+
+async def stream_preview(file: UploadFile):
+    total = 0
+    errors = 0
+
+    try:
+        async for row_number, item in iter_vocabulary_rows(file):
+            if item is None:
+                errors += 1
+                line = {"type": "error", "row": row_number, "message": f"Row {row_number}: missing required field"}
+            else:
+                total += 1
+                line = {"type": "item", "row": row_number, "item": item}
+            yield json.dumps(line) + "\n"
+    except CsvImportError as e:
+        # Headers are already sent, so the failure goes in the stream
+        yield json.dumps({"type": "error", "message": str(e)}) + "\n"
+        return
+
+    yield json.dumps({"type": "summary", "total": total, "errors": errors}) + "\n"
+
 @router.post("/save")
-def create_vocabulary_list(
+async def create_vocabulary_list(
     data: VocabularyListCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: User = Depends(require_roles("teacher"))
 ):
+    """
+    Save a vocabulary list and link its items.
+
+    Items are shared between lists and unique on (word, translation): each
+    batch is one INSERT ... ON CONFLICT that creates missing items and returns
+    the ids of new and existing ones alike, followed by one insert of the links.
+    """
     vocab_list = VocabularyList(
         title = data.title,
         description=data.description,
@@ -68,25 +122,34 @@ def create_vocabulary_list(
     )
 
     db.add(vocab_list)
-    db.commit()
-    db.refresh(vocab_list)
+    await db.flush()
 
+    # The same word can appear twice in an upload; keep the first
+    rows = {}
     for item_data in data.items:
-        statement = select(VocabularyItem).where(
-            VocabularyItem.word == item_data.word,
-            VocabularyItem.translation == item_data.translation
+        rows.setdefault((item_data.word, item_data.translation), {"id": uuid.uuid4(), **item_data.model_dump()})
+    rows = list(rows.values())
+
+    item_ids = []
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        statement = dialect_insert(db, VocabularyItem).values(rows[start:start + UPSERT_BATCH_SIZE])
+        statement = statement.on_conflict_do_update(
+            index_elements=["word", "translation"],
+            # Fill in details an existing item is missing; never overwrite them.
+            # Also makes RETURNING include rows that already existed.
+            set_={
+                column: func.coalesce(getattr(VocabularyItem, column), getattr(statement.excluded, column))
+                for column in ("part_of_speech", "example_sentence", "regional_notes")
+            }
+        ).returning(VocabularyItem.id)
+        item_ids.extend((await db.execute(statement)).scalars())
+
+    if item_ids:
+        await db.execute(
+            insert(VocabularyListItem),
+            [{"vocabulary_list_id": vocab_list.id, "vocabulary_item_id": item_id} for item_id in item_ids]
         )
-        existing_item = db.exec(statement).first()
-
-        if existing_item:
-            item = existing_item
-        else:
-            item = VocabularyItem(**item_data.model_dump())
-            vocab_list.items.append(item)
-            db.add(item)
-            db.commit()
-            db.refresh(item)
-
-    db.commit()
+
+    await db.commit()
 
     return vocab_list
\ No newline at end of file
@@ -0,0 +1,200 @@
+"""
+Versioned schema changes for databases that already exist.
+
+create_all only creates missing tables; it never adds columns or indexes
+to a table that is already there. Changes like that are listed here as
+numbered migrations. init_db runs every migration not yet recorded in
+schema_migrations, in order, each in its own transaction.
+
+Migrations must be safe to run on a database that create_all has just
+built from the current models (a fresh install), so they check for what
+they add (IF NOT EXISTS, or the inspector) instead of assuming it is missing.
+
+Indexes go through _create_index. On Postgres a plain CREATE INDEX blocks
+writes to the table for the whole build, so there the index is built
+CONCURRENTLY once the migration's transaction has committed (CONCURRENTLY
+can't run inside one), and the version is recorded after that. A migration
+that fails part way is simply run again on the next start.
+
+To add one, append a function to MIGRATIONS with the next version number.
+Never edit or reorder a migration that has shipped.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+from sqlmodel import select
+
+from ..models.schema_migration import SchemaMigration
+
+# Postgres advisory lock key, so app workers starting together don't race
+MIGRATION_LOCK_ID = 727465
+
+
+# conn.info key for the indexes a migration leaves to build after its transaction
+DEFERRED_INDEXES = "deferred_indexes"
+
+
+def _create_index(conn: Connection, name: str, table: str, columns: list[str], unique: bool = False):
+    kind = "UNIQUE INDEX" if unique else "INDEX"
+    target = f"{name} ON {table} ({', '.join(columns)})"
+    if conn.dialect.name == "postgresql":
+        ddl = f"CREATE {kind} CONCURRENTLY IF NOT EXISTS {target}"
+        conn.info.setdefault(DEFERRED_INDEXES, []).append((name, ddl))
+        return
+    conn.execute(text(f"CREATE {kind} IF NOT EXISTS {target}"))
+
+
+def _build_deferred_indexes(conn: Connection):
+    """Build the indexes queued by _create_index, outside any transaction (Postgres only)."""
+    deferred = conn.info.pop(DEFERRED_INDEXES, [])
+    if not deferred:
+        return
+
+    isolation_level = conn.get_isolation_level()
+    conn.execution_options(isolation_level="AUTOCOMMIT")
+    try:
+        for name, ddl in deferred:
+            # A failed concurrent build leaves an invalid index that IF NOT EXISTS would skip
+            invalid = conn.execute(text(
+                "SELECT 1 FROM pg_class c JOIN pg_index i ON i.indexrelid = c.oid "
+                "WHERE c.relname = :name AND NOT i.indisvalid"
+            ), {"name": name}).first()
+            if invalid:
+                conn.execute(text(f"DROP INDEX CONCURRENTLY IF EXISTS {name}"))
+            conn.execute(text(ddl))
+    finally:
+        # Each statement committed on its own; this only closes SQLAlchemy's
+        # autobegun transaction so the isolation level can be put back
+        conn.rollback()
+        conn.execution_options(isolation_level=isolation_level)
+
+
+def _add_column(conn: Connection, table: str, column: str, ddl_type: str):
+    inspector = inspect(conn)
+    if not inspector.has_table(table):
+        return
+    if column in {col["name"] for col in inspector.get_columns(table)}:
+        return
+    conn.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl_type}"))
+
+
+def foreign_key_indexes(conn: Connection):
+    _create_index(conn, "ix_conversation_turns_session_id_turn_number", "conversation_turns", ["session_id", "turn_number"])
+    _create_index(conn, "ix_conversation_sessions_exam_id", "conversation_sessions", ["exam_id"])
+    _create_index(conn, "ix_conversation_sessions_student_id", "conversation_sessions", ["student_id"])
+    _create_index(conn, "ix_session_scores_session_id", "session_scores", ["session_id"])
+    _create_index(conn, "ix_exams_created_by_id", "exams", ["created_by_id"])
+    _create_index(conn, "ix_users_teacher_id", "users", ["teacher_id"])
+    _create_index(conn, "ix_vocabulary_lists_teacher_id", "vocabulary_lists", ["teacher_id"])
+
+
+def session_metrics_token_usage(conn: Connection):
+    _add_column(conn, "session_metrics", "token_usage", "TEXT")
+
+
+def unique_vocabulary_items(conn: Connection):
+    # Merge duplicate (word, translation) items into the first one, moving their list links over
+    rows = conn.execute(text(
+        "SELECT id, word, translation FROM vocabulary_items ORDER BY word, translation, id"
+    )).all()
+
+    keep = {}
+    for item_id, word, translation in rows:
+        keeper = keep.setdefault((word, translation), item_id)
+        if keeper == item_id:
+            continue
+
+        params = {"keep": keeper, "dup": item_id}
+        conn.execute(text(
+            "UPDATE vocabulary_list_items SET vocabulary_item_id = :keep "
+            "WHERE vocabulary_item_id = :dup AND vocabulary_list_id NOT IN "
+            "(SELECT vocabulary_list_id FROM vocabulary_list_items WHERE vocabulary_item_id = :keep)"
+        ), params)
+        conn.execute(text("DELETE FROM vocabulary_list_items WHERE vocabulary_item_id = :dup"), params)
+        conn.execute(text("DELETE FROM vocabulary_items WHERE id = :dup"), params)
+
+    # If a duplicate slips in before the concurrent build, the build fails and
+    # the whole migration, merge included, runs again on the next start
+    _create_index(conn, "uq_vocabulary_items_word_translation", "vocabulary_items", ["word", "translation"], unique=True)
+
+
+def keyset_pagination(conn: Connection):
+    _add_column(conn, "vocabulary_lists", "created_at", "TIMESTAMP")
+
+    # Keyset pagination orders by created_at, so it can't be NULL
+    for table in ("users", "exams", "conversation_sessions", "vocabulary_lists"):
+        conn.execute(text(f"UPDATE {table} SET created_at = CURRENT_TIMESTAMP WHERE created_at IS NULL"))
+
+    _create_index(conn, "ix_users_created_at_id", "users", ["created_at", "id"])
+    _create_index(conn, "ix_exams_created_by_id_created_at", "exams", ["created_by_id", "created_at", "id"])
+    _create_index(conn, "ix_conversation_sessions_created_at_id", "conversation_sessions", ["created_at", "id"])
+    _create_index(conn, "ix_vocabulary_lists_teacher_id_created_at", "vocabulary_lists", ["teacher_id", "created_at", "id"])
+
+
+def unique_exam_sessions(conn: Connection):
+    # Duplicates may hold graded work (e.g. a retake), so they are left for
+    # someone to resolve by hand rather than deleted here
+    duplicates = conn.execute(text(
+        "SELECT exam_id, student_id, COUNT(*) FROM conversation_sessions "
+        "GROUP BY exam_id, student_id HAVING COUNT(*) > 1 ORDER BY exam_id, student_id"
+    )).all()
+    if duplicates:
+        shown = "\n".join(
+            f"  exam {exam_id}, student {student_id}: {count} sessions"
+            for exam_id, student_id, count in duplicates[:20]
+        )
+        more = f"\n  ... and {len(duplicates) - 20} more" if len(duplicates) > 20 else ""
+        raise RuntimeError(
+            f"{len(duplicates)} student(s) have more than one session for the same exam:\n"
+            f"{shown}{more}\n"
+            "Keep one session for each and delete the others (with their conversation_turns, "
+            "session_scores, session_metrics and scoring_jobs), then restart."
+        )
+
+    _create_index(
+        conn, "uq_conversation_sessions_exam_id_student_id", "conversation_sessions",
+        ["exam_id", "student_id"], unique=True,
+    )
+
+
+MIGRATIONS = [
+    (1, "Index foreign keys used by dashboard and turn history queries", foreign_key_indexes),
+    (2, "Add session_metrics.token_usage", session_metrics_token_usage),
+    (3, "Deduplicate vocabulary items and make (word, translation) unique", unique_vocabulary_items),
+    (4, "Add vocabulary_lists.created_at and keyset pagination indexes", keyset_pagination),
+    (5, "Make (exam_id, student_id) unique on conversation_sessions", unique_exam_sessions),
+]
+
+
+def run_migrations(conn: Connection):
+    """Apply pending migrations in version order."""
+    if conn.dialect.name == "postgresql":
+        conn.execute(text("SELECT pg_advisory_lock(:id)"), {"id": MIGRATION_LOCK_ID})
+
+    try:
+        applied = set(conn.execute(select(SchemaMigration.version)).scalars())
+        conn.commit()
+
+        for version, description, migrate in MIGRATIONS:
+            if version in applied:
+                continue
+
+            print(f"Applying migration {version}: {description}")
+            conn.info.pop(DEFERRED_INDEXES, None)
+            with conn.begin():
+                migrate(conn)
+            _build_deferred_indexes(conn)
+
+            with conn.begin():
+                conn.execute(
+                    SchemaMigration.__table__.insert().values(
+                        version=version,
+                        description=description,
+                        applied_at=datetime.now(timezone.utc)
+                    )
+                )
+    finally:
+        if conn.dialect.name == "postgresql":
+            conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": MIGRATION_LOCK_ID})
+            conn.commit()
@@ -0,0 +1,37 @@
+"""
+Counts SQL statements sent through an engine.
+
+Used to check that an endpoint's query count stays constant as the data
+grows, i.e. that it has no N+1 pattern:
+
+    with count_queries() as counter:
+        await teacher_dashboard(db=db, current_user=teacher)
+    assert counter.count == 6
+"""
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from .database import async_engine
+
+
+class QueryCounter:
+    def __init__(self):
+        self.count = 0
+        self.statements: list[str] = []
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+        self.statements.append(statement)
+
+
+@contextmanager
+def count_queries(engine=None):
+    """Count statements executed on the engine (the app's async engine by default) while the block runs."""
+    engine = engine or async_engine.sync_engine
+    counter = QueryCounter()
+    event.listen(engine, "before_cursor_execute", counter)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, "before_cursor_execute", counter)
@@ -1,6 +1,7 @@
 """
 Seed the database with initial data for development.
 """
+from sqlalchemy import exists
 from sqlmodel import Session, select
 from ..models.user import User
 from ..models.conversation_session import ConversationSession
@@ -10,14 +11,9 @@ from ..utils.password import hash_password
 def seed_users(db: Session):
     """Add test users if none exist."""
     
-    # Check if users already exist
-    statement = select(User)
-    results = db.exec(statement)
-    users = results.all()
-    user_count = len(users)
-    
-    if user_count > 0:
-        print(f"Database already has {user_count} users. Skipping seed.")
+    # EXISTS stops at the first row, however large the table is
+    if db.exec(select(exists().select_from(User))).one():
+        print("Database already has users. Skipping seed.")
         return
     
     # Create test users
@@ -46,13 +42,8 @@ def seed_users(db: Session):
 
 
 def seed_vocabulary(db:Session):
-    statement = select(VocabularyListItem)
-    results = db.exec(statement)
-    vocab = results.all()
-    vocab_count = len(vocab)
-
-    if vocab_count > 0:
-        print(f"Database already has {vocab_count} vocabulary list items. Skipping seed")
+    if db.exec(select(exists().select_from(VocabularyListItem))).one():
+        print("Database already has vocabulary list items. Skipping seed")
         return
     
     teacher_statement = select(User).where(User.role=="teacher")
@@ -0,0 +1,26 @@
+"""
+Column types shared by the models.
+"""
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    TIMESTAMP WITHOUT TIME ZONE holding naive UTC.
+
+    The app works with timezone-aware datetimes (datetime.now(timezone.utc),
+    query parameters with an offset). psycopg2 let those through, but asyncpg
+    rejects an aware value bound to a timestamp without time zone, so they are
+    converted to UTC and stripped here, on every insert, update and filter.
+    Values read back are naive UTC, as they always were.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
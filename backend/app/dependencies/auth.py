@@ -4,10 +4,12 @@ from uuid import UUID
 
 from fastapi import Depends, HTTPException, status, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlmodel import Session, select
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from ..database.database import get_db
 from ..models.user import User, AuthResponse
+from ..services.user_cache import user_cache
 from ..utils.jwt import decode_token
 
 security = HTTPBearer(auto_error=False)
@@ -25,12 +27,15 @@ def get_token_from_request(
     return request.cookies.get("jwt")
 
 
-def get_current_user(
+async def get_current_user(
     token: Optional[str] = Depends(get_token_from_request),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> User:
     """
     Dependency that gets the current authenticated user.
+
+    The user comes from user_cache when it can, so most requests don't query
+    the users table. The returned User may be detached; don't add it to a session.
     """
     if not token:
         raise HTTPException(
@@ -55,14 +60,17 @@ def get_current_user(
         )
     
     # Check if user still exists
-    statement = select(User).where(User.id == UUID(user_id))
-    user = db.exec(statement).first()
-    
+    user = await user_cache.get(UUID(user_id))
     if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="The user belonging to this token no longer exists"
-        )
+        statement = select(User).where(User.id == UUID(user_id))
+        user = (await db.exec(statement)).first()
+
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="The user belonging to this token no longer exists"
+            )
+        await user_cache.set(user)
     
     # Check if user changed password after token was issued
     token_issued_at = datetime.fromtimestamp(payload.get("iat", 0))
@@ -75,9 +83,9 @@ def get_current_user(
     return user
 
 
-def get_current_user_optional(
+async def get_current_user_optional(
     token: Optional[str] = Depends(get_token_from_request),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[User]:
     """
     Same as get_current_user but returns None instead of raising an exception.
@@ -87,7 +95,7 @@ def get_current_user_optional(
         return None
     
     try:
-        return get_current_user(token, db)
+        return await get_current_user(token, db)
     except HTTPException:
         return None
 
@@ -101,7 +109,7 @@ def require_roles(*allowed_roles: str):
         def admin_route():
             ...
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
+    async def role_checker(current_user: User = Depends(get_current_user)) -> User:
         if current_user.role not in allowed_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
@@ -1,10 +1,15 @@
 from fastapi import FastAPI, WebSocket
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
 from contextlib import asynccontextmanager
-from sqlmodel import Session
 
-from .database.database import engine, init_db
+from .database.database import async_engine, async_session, init_db
 from .database.seed import seed_all
+from .config import settings
+from .services.clients import provider_clients
+from .services.password_hasher import password_hasher
+from .services.scoring_queue import scoring_queue
 from .controllers import user as user_controller
 from .controllers import auth as auth_controller
 from .controllers import conversation_session as conversation_session_controller
@@ -12,6 +17,7 @@ from .controllers import exam as exam_controller
 from .controllers import vocabulary as vocabulary_controller
 from .controllers import realtime as realtime_controller
 from .websockets.conversation import ConversationHandler
+from .utils.metrics import metrics
 
 
 
@@ -19,18 +25,38 @@ from .websockets.conversation import ConversationHandler
 async def lifespan(app: FastAPI):
     # Startup
     print("Creating database tables...")
-    init_db()
+    await init_db()
     
-    print("Seeding database...")
-    with Session(engine) as db:
-        seed_all(db)
+    if settings.seed_on_startup:
+        print("Seeding database...")
+        async with async_session() as db:
+            await db.run_sync(seed_all)
+
+    if not settings.use_mock_services:
+        print("Opening provider connection pools...")
+        provider_clients.open()
+
+    print("Starting scoring workers...")
+    await scoring_queue.start()
+    password_hasher.start()
 
     yield 
     
     print("Shutting down...")
+    await scoring_queue.stop()
+    password_hasher.stop()
+    await provider_clients.close()
+    await async_engine.dispose()
 
 app = FastAPI(title="Language Tutor API", lifespan=lifespan)
 
+try:
+    # Optional; falls back to gzip for clients that don't accept br
+    from brotli_asgi import BrotliMiddleware
+    app.add_middleware(BrotliMiddleware, minimum_size=settings.compression_minimum_size, gzip_fallback=True)
+except ImportError:
+    app.add_middleware(GZipMiddleware, minimum_size=settings.compression_minimum_size)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "http://localhost:3000", "https://gato-lingo.netlify.app"],
@@ -53,6 +79,10 @@ conversation_handler = ConversationHandler()
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics_endpoint():
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
 @app.websocket("/ws/conversation")
 async def websocket_endpoint(websocket: WebSocket):
     await conversation_handler.handle_connection(websocket)
\ No newline at end of file
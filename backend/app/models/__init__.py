@@ -4,7 +4,12 @@ from .exam import Exam, ExamCreate
 from .conversation_session import ConversationSession, SessionAssignment, SessionStatus
 from .conversation_turn import ConversationTurn
 from .session_score import SessionScore
+from .scoring_job import ScoringJob, ScoringJobStatus
+from .session_metrics import SessionMetrics
+from .exam_opening import ExamOpening
+from .schema_migration import SchemaMigration
 
 from ..schemas.responses import (
-    ExamResponse, DashboardExamResponse, ConversationSessionResponse, StudentAssignmentResponse, SessionScoreResponse
+    ExamResponse, ExamSummaryResponse, DashboardExamResponse, ConversationSessionResponse,
+    StudentAssignmentResponse, StudentAssignmentSummaryResponse, SessionScoreResponse
 )
\ No newline at end of file
@@ -1,8 +1,10 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING, List
 import uuid
 from enum import Enum
+from ..database.types import UTCDateTime
 
 class SessionStatus(str, Enum):
     assigned = "assigned"
@@ -18,21 +20,27 @@ if TYPE_CHECKING:
 
 class ConversationSession(SQLModel, table=True):
     __tablename__ = "conversation_sessions"
+    __table_args__ = (
+        # Newest first (keyset pagination)
+        Index("ix_conversation_sessions_created_at_id", "created_at", "id"),
+        # One session per student per exam
+        Index("uq_conversation_sessions_exam_id_student_id", "exam_id", "student_id", unique=True),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     
     # Session status and timing
     status: SessionStatus = Field(default=SessionStatus.assigned)
-    due_date: Optional[datetime] = Field(default=None)
-    started_at: Optional[datetime] = Field(default=None)
-    ended_at: Optional[datetime] = Field(default=None)
-    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+    due_date: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
+    started_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
+    ended_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
     transcript: Optional[str] = Field(default=None)
     
 
     # Foreign Keys – should be on the "many" side of relationship
-    exam_id: Optional[uuid.UUID] = Field(default=None, foreign_key="exams.id")
-    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
+    exam_id: Optional[uuid.UUID] = Field(default=None, foreign_key="exams.id", index=True)
+    student_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id", index=True)
 
     # Relationships (virtual fields)
     exam: Optional["Exam"] = Relationship(back_populates="sessions") 
@@ -45,7 +53,8 @@ class ConversationSession(SQLModel, table=True):
 class SessionAssignment(SQLModel):
     """Schema for assigning an exam to students."""
     exam_id: uuid.UUID
-    student_ids: List[uuid.UUID]  # Can assign to multiple students at once
+    student_ids: List[uuid.UUID] = []  # Can assign to multiple students at once
+    assign_all: bool = False  # Assign to every student of the teacher; student_ids is ignored
     due_date: Optional[datetime] = None
 
 # Import response schema from shared file
@@ -1,17 +1,23 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING
 import uuid
+from ..database.types import UTCDateTime
 
 if TYPE_CHECKING:
     from .conversation_session import ConversationSession
 
 class ConversationTurn(SQLModel, table=True):
     __tablename__ = "conversation_turns"
+    __table_args__ = (
+        # Turn history is always read by session in turn order; also serves session_id lookups
+        Index("ix_conversation_turns_session_id_turn_number", "session_id", "turn_number"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     
-    timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+    timestamp: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
     speaker: str 
     audio_url: Optional[str] = None
     transcript: str
@@ -1,7 +1,9 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional, List, TYPE_CHECKING
 import uuid
+from ..database.types import UTCDateTime
 
 if TYPE_CHECKING:
     from .user import User
@@ -10,6 +12,10 @@ if TYPE_CHECKING:
 
 class Exam(SQLModel, table=True):
     __tablename__ = "exams"
+    __table_args__ = (
+        # A teacher's exams, newest first (keyset pagination)
+        Index("ix_exams_created_by_id_created_at", "created_by_id", "created_at", "id"),
+    )
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     
@@ -26,11 +32,11 @@ class Exam(SQLModel, table=True):
     vocabulary_list_manual: Optional[str] = None # Use this field until set up vocab list uploads
     difficulty_level: str
     
-    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: Optional[datetime] = Field(default=None)
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
+    updated_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
 
     # Foreign Keys
-    created_by_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
+    created_by_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id", index=True)
     vocabulary_list_id: Optional[uuid.UUID] = Field(default=None, foreign_key="vocabulary_lists.id")
     
     # Relationships
@@ -54,4 +60,6 @@ class ExamCreate(SQLModel):
     vocabulary_list_id: Optional[uuid.UUID] = None
     difficulty_level: str
 
-from ..schemas.responses import ExamResponse, DashboardExamResponse, StudentAssignmentResponse
\ No newline at end of file
+from ..schemas.responses import (
+    ExamResponse, ExamSummaryResponse, DashboardExamResponse, StudentAssignmentResponse, StudentAssignmentSummaryResponse
+)
\ No newline at end of file
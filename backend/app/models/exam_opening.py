@@ -0,0 +1,20 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+from ..database.types import UTCDateTime
+
+class ExamOpening(SQLModel, table=True):
+    """Tutor opening line and its audio, generated once per exam prompt."""
+    __tablename__ = "exam_openings"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    prompt_hash: str  # sha256 of the conversation_prompt the opening was generated from
+    text: str
+    audio: bytes
+    audio_format: str
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
+
+    # Foreign Keys
+    exam_id: uuid.UUID = Field(foreign_key="exams.id", unique=True, index=True)
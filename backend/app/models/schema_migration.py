@@ -0,0 +1,11 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+from typing import Optional
+from ..database.types import UTCDateTime
+
+class SchemaMigration(SQLModel, table=True):
+    __tablename__ = "schema_migrations"
+
+    version: int = Field(primary_key=True)
+    description: str
+    applied_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
@@ -0,0 +1,37 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+from enum import Enum
+from ..database.types import UTCDateTime
+
+class ScoringJobStatus(str, Enum):
+    queued = "queued"
+    running = "running"
+    done = "done"
+    failed = "failed"
+
+
+class ScoringJob(SQLModel, table=True):
+    __tablename__ = "scoring_jobs"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    status: ScoringJobStatus = Field(default=ScoringJobStatus.queued)
+    attempts: int = Field(default=0)
+    last_error: Optional[str] = Field(default=None)
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
+    updated_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
+    finished_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
+
+    # Foreign Keys – one job per session keeps enqueueing idempotent
+    session_id: uuid.UUID = Field(foreign_key="conversation_sessions.id", unique=True, index=True)
+
+
+class ScoringJobResponse(SQLModel):
+    session_id: uuid.UUID
+    status: ScoringJobStatus
+    attempts: int
+    last_error: Optional[str]
+    created_at: datetime
+    finished_at: Optional[datetime]
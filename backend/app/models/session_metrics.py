@@ -0,0 +1,17 @@
+from sqlmodel import SQLModel, Field
+from datetime import datetime, timezone
+from typing import Optional
+import uuid
+from ..database.types import UTCDateTime
+
+class SessionMetrics(SQLModel, table=True):
+    __tablename__ = "session_metrics"
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
+
+    latency_summary: str  # JSON object: stage -> {count, mean, p50, p95, max} in seconds
+    token_usage: Optional[str] = Field(default=None)  # JSON array: per-turn LLM token counts
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
+
+    # Foreign Keys
+    session_id: uuid.UUID = Field(foreign_key="conversation_sessions.id", unique=True, index=True)
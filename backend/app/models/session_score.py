@@ -3,6 +3,7 @@ from sqlmodel import SQLModel, Field, Relationship
 from datetime import datetime, timezone
 from typing import Optional, TYPE_CHECKING, List
 import uuid
+from ..database.types import UTCDateTime
 
 if TYPE_CHECKING:
     from .conversation_session import ConversationSession
@@ -21,10 +22,10 @@ class SessionScore(SQLModel, table=True):
     vocabulary_used: Optional[str] 
     vocabulary_missed: Optional[str]
     grammar_feedback: Optional[str]
-    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
     
     # Foreign Keys
-    session_id: uuid.UUID = Field(foreign_key="conversation_sessions.id")
+    session_id: uuid.UUID = Field(foreign_key="conversation_sessions.id", index=True)
     
     # Relationships (virtual fields)
     session: Optional["ConversationSession"] = Relationship(back_populates="session_score")
\ No newline at end of file
@@ -1,8 +1,10 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
 from pydantic import EmailStr, model_validator
 from datetime import datetime, timezone
 from typing import Optional, List, TYPE_CHECKING
 import uuid
+from ..database.types import UTCDateTime
 
 if TYPE_CHECKING:
     from .conversation_session import ConversationSession
@@ -11,6 +13,10 @@ if TYPE_CHECKING:
 
 class User(SQLModel, table=True):
     __tablename__ = "users"
+    __table_args__ = (
+        # Newest first (keyset pagination)
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     email: str = Field(unique=True, index=True)
@@ -22,16 +28,16 @@ class User(SQLModel, table=True):
     target_language: Optional[str] = None  # Optional = nullable
     
     # Timestamps
-    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: Optional[datetime] = Field(default=None)
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
+    updated_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
     
     # Password reset fields (internal only)
-    password_changed_at: Optional[datetime] = Field(default=None)
+    password_changed_at: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
     password_reset_token: Optional[str] = Field(default=None)
-    password_reset_expires: Optional[datetime] = Field(default=None)
+    password_reset_expires: Optional[datetime] = Field(default=None, sa_type=UTCDateTime)
 
     # Relationships
-    teacher_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
+    teacher_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id", index=True)
     teacher: Optional["User"] = Relationship(
         back_populates="students",
         sa_relationship_kwargs={
@@ -129,3 +135,29 @@ class MessageResponse(SQLModel):
     status: str = "success"
     message: str
 
+
+class RosterStudent(SQLModel):
+    """One student in a roster import. Without a password, a temporary one is generated."""
+    email: str
+    first_name: str
+    last_name: str
+    password: Optional[str] = None
+    native_language: Optional[str] = None
+    target_language: Optional[str] = None
+
+class RosterImportRequest(SQLModel):
+    students: List[RosterStudent]
+
+class RosterRowResult(SQLModel):
+    row: int
+    email: str
+    # created, already_linked, duplicate, conflict or invalid
+    status: str
+    user_id: Optional[uuid.UUID] = None
+    temporary_password: Optional[str] = None
+    message: Optional[str] = None
+
+class RosterImportResponse(SQLModel):
+    created: int
+    skipped: int
+    results: List[RosterRowResult]
@@ -1,6 +1,9 @@
+from sqlalchemy import Index
 from sqlmodel import SQLModel, Field, Relationship
+from datetime import datetime, timezone
 from typing import Optional, List, TYPE_CHECKING
 import uuid
+from ..database.types import UTCDateTime
 
 if TYPE_CHECKING:
     from .user import User
@@ -17,6 +20,10 @@ class VocabularyListItem(SQLModel, table=True):
 
 class VocabularyItem(SQLModel, table=True):
     __tablename__ = "vocabulary_items"
+    __table_args__ = (
+        # Items are shared between lists; saving a list upserts on this
+        Index("uq_vocabulary_items_word_translation", "word", "translation", unique=True),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     word: str
@@ -33,13 +40,18 @@ class VocabularyItem(SQLModel, table=True):
 
 class VocabularyList(SQLModel, table=True):
     __tablename__ = "vocabulary_lists"
+    __table_args__ = (
+        # A teacher's lists, newest first (keyset pagination)
+        Index("ix_vocabulary_lists_teacher_id_created_at", "teacher_id", "created_at", "id"),
+    )
     
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str
     description: Optional[str] = None
     target_language: str
+    created_at: Optional[datetime] = Field(default_factory=lambda: datetime.now(timezone.utc), sa_type=UTCDateTime)
     
-    teacher_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id")
+    teacher_id: Optional[uuid.UUID] = Field(default=None, foreign_key="users.id", index=True)
     
     teacher: Optional["User"] = Relationship(
         back_populates="vocabulary_lists",
@@ -1,10 +1,21 @@
+from pydantic import BaseModel
 from sqlmodel import SQLModel
 from datetime import datetime
-from typing import Optional, List
+from typing import Generic, Optional, List, TypeVar
 from decimal import Decimal
 from uuid import UUID
 from enum import Enum
 
+T = TypeVar("T")
+
+
+class Page(BaseModel, Generic[T]):
+    """One page of a list endpoint; pass next_cursor back as ?cursor= for the next one."""
+    items: List[T]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
 class SessionStatus(str, Enum):
     assigned = "assigned"
     in_progress = "in_progress"
@@ -26,6 +37,12 @@ class VocabularyListResponse(SQLModel):
     teacher_id: Optional[UUID] = None
     items: List[VocabularyItemResponse] = []
 
+class VocabularyListSummaryResponse(SQLModel):
+    id: UUID
+    title: str
+    description: Optional[str] = None
+    target_language: str
+
 class SessionScoreResponse(SQLModel):
     id: UUID
     vocabulary_usage_score: Decimal 
@@ -65,8 +82,24 @@ class ExamResponse(SQLModel):
     created_at: datetime
 
 
+class ExamSummaryResponse(SQLModel):
+    """ExamResponse for list views: no conversation prompt, vocabulary list without its items."""
+    id: UUID
+    title: str
+    description: Optional[str]
+    target_language: str
+    difficulty_level: str
+    topic: str
+    tenses: Optional[str]
+    vocabulary_list_id: Optional[UUID]
+    vocabulary_list: Optional[VocabularyListSummaryResponse]
+    cultural_context: Optional[str]
+    created_by_id: Optional[UUID]
+    created_at: datetime
+
+
 class DashboardExamResponse(SQLModel):
-    exam: ExamResponse
+    exam: ExamSummaryResponse
     total_assigned: int
     pending: int
     in_progress: int
@@ -84,4 +117,17 @@ class StudentAssignmentResponse(SQLModel):
     student_id: Optional[UUID]
 
     exam: Optional[ExamResponse] = None
-    session_score: Optional[SessionScoreResponse] = None
\ No newline at end of file
+    session_score: Optional[SessionScoreResponse] = None
+
+
+class StudentAssignmentSummaryResponse(SQLModel):
+    id: UUID
+    status: SessionStatus
+    due_date: Optional[datetime]
+    started_at: Optional[datetime]
+    ended_at: Optional[datetime]
+    created_at: datetime
+    student_id: Optional[UUID]
+
+    exam: Optional[ExamSummaryResponse] = None
+    session_score: Optional[SessionScoreResponse] = None
@@ -0,0 +1,73 @@
+"""
+Shared provider clients.
+
+One AsyncAnthropic and one AsyncOpenAI client per process, each owning a
+keep-alive HTTP connection pool. The pools are opened in the FastAPI lifespan
+and closed on shutdown; services resolve them on first use.
+
+The SDKs are imported when a client is first created, not at module import:
+together they take most of a second to import, which mock-mode processes
+and scripts never need to pay.
+"""
+from typing import Optional, TYPE_CHECKING
+
+import httpx
+
+from ..config import settings
+
+if TYPE_CHECKING:
+    import anthropic
+    import openai
+
+
+def _pool_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.provider_max_connections,
+        max_keepalive_connections=settings.provider_max_keepalive_connections,
+    )
+
+
+class ProviderClients:
+    def __init__(self):
+        self._anthropic: Optional["anthropic.AsyncAnthropic"] = None
+        self._openai: Optional["openai.AsyncOpenAI"] = None
+
+    @property
+    def anthropic(self) -> "anthropic.AsyncAnthropic":
+        if self._anthropic is None:
+            import anthropic
+
+            self._anthropic = anthropic.AsyncAnthropic(
+                api_key=settings.anthropic_api_key,
+                timeout=settings.provider_timeout_seconds,
+                http_client=anthropic.DefaultAsyncHttpxClient(limits=_pool_limits()),
+            )
+        return self._anthropic
+
+    @property
+    def openai(self) -> "openai.AsyncOpenAI":
+        if self._openai is None:
+            import openai
+
+            self._openai = openai.AsyncOpenAI(
+                api_key=settings.openai_api_key,
+                timeout=settings.provider_timeout_seconds,
+                http_client=openai.DefaultAsyncHttpxClient(limits=_pool_limits()),
+            )
+        return self._openai
+
+    def open(self):
+        """Create both clients up front so the first request doesn't pay for it."""
+        self.anthropic
+        self.openai
+
+    async def close(self):
+        if self._anthropic is not None:
+            await self._anthropic.close()
+            self._anthropic = None
+        if self._openai is not None:
+            await self._openai.close()
+            self._openai = None
+
+
+provider_clients = ProviderClients()
@@ -1,9 +1,29 @@
-import anthropic
-from typing import Optional
+from typing import AsyncIterator, Optional, TYPE_CHECKING
+
+from ..config import settings
+from ..utils.metrics import metrics
+from .clients import provider_clients
+
+if TYPE_CHECKING:
+    import anthropic
+
+LLM_TOKENS = metrics.counter(
+    "gato_llm_tokens_total",
+    "Tokens used by conversation LLM calls",
+    ("model", "kind"),
+)
 
 class ConversationEngine:
-    def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    provider = "anthropic"
+    model = "claude-haiku-4-5"
+
+    def __init__(self, client: Optional["anthropic.AsyncAnthropic"] = None):
+        self._client = client
+
+    @property
+    def client(self) -> "anthropic.AsyncAnthropic":
+        # Resolved on use so the shared pool opened in the lifespan is picked up
+        return self._client or provider_clients.anthropic
     
     def build_system_prompt(
         self,
@@ -61,33 +81,107 @@ Focus on eliciting these tenses: {tenses_formatted}
 - This prompt is used as instructions for an application designed to conduct automated conversational assessments with language learners.
 """
 
+    def _system(self, system_prompt: str, history_summary: Optional[str] = None) -> list[dict]:
+        blocks = [{"type": "text", "text": system_prompt}]
+        if settings.prompt_caching_enabled:
+            # The exam prompt is identical on every turn, so let the provider cache it
+            blocks[0]["cache_control"] = {"type": "ephemeral"}
+        if history_summary:
+            # After the cached block so the summary changing doesn't invalidate it
+            blocks.append({"type": "text", "text": f"# Earlier in this conversation\n{history_summary}"})
+        return blocks
+
+    def _record_usage(self, response_usage, usage: Optional[dict]):
+        values = {
+            "input_tokens": response_usage.input_tokens,
+            "output_tokens": response_usage.output_tokens,
+            "cache_read_input_tokens": getattr(response_usage, "cache_read_input_tokens", None) or 0,
+            "cache_creation_input_tokens": getattr(response_usage, "cache_creation_input_tokens", None) or 0,
+        }
+        for kind, count in values.items():
+            LLM_TOKENS.inc(count, model=self.model, kind=kind)
+        if usage is not None:
+            usage.update(values)
+
     async def generate_response(
         self,
         system_prompt: str,
         conversation_history: list[dict],
-        student_message: str
+        student_message: str,
+        history_summary: Optional[str] = None,
+        usage: Optional[dict] = None
     ) -> str:
         messages = conversation_history + [
             {"role": "user", "content": student_message}
         ]
         
-        response = self.client.messages.create(
-            model="claude-haiku-4-5",
+        response = await self.client.messages.create(
+            model=self.model,
             max_tokens=250,
-            system=system_prompt,
+            system=self._system(system_prompt, history_summary),
             messages=messages
         )
+        self._record_usage(response.usage, usage)
         
         return response.content[0].text
+
+    async def stream_response(
+        self,
+        system_prompt: str,
+        conversation_history: list[dict],
+        student_message: str,
+        history_summary: Optional[str] = None,
+        usage: Optional[dict] = None
+    ) -> AsyncIterator[str]:
+        """Yield the tutor reply as text deltas while the model is still generating."""
+        messages = conversation_history + [
+            {"role": "user", "content": student_message}
+        ]
+
+        async with self.client.messages.stream(
+            model=self.model,
+            max_tokens=250,
+            system=self._system(system_prompt, history_summary),
+            messages=messages
+        ) as stream:
+            async for text in stream.text_stream:
+                yield text
+
+            final_message = await stream.get_final_message()
+            self._record_usage(final_message.usage, usage)
     
     async def generate_opening(self, system_prompt: str) -> str:
-        response = self.client.messages.create(
-            model="claude-haiku-4-5",
+        response = await self.client.messages.create(
+            model=self.model,
             max_tokens=200,
-            system=system_prompt,
+            system=self._system(system_prompt),
             messages=[
                 {"role": "user", "content": "[The student has just joined. Begin the conversation with a friendly greeting and naturally introduce the topic.]"}
             ]
         )
         
+        return response.content[0].text
+
+    async def summarize_history(
+        self,
+        messages: list[dict],
+        previous_summary: Optional[str] = None
+    ) -> str:
+        """Fold older turns into a short running summary of the conversation."""
+        transcript = "\n".join(
+            f"{'student' if message['role'] == 'user' else 'tutor'}: {message['content']}"
+            for message in messages
+        )
+        previous = f"Summary so far:\n{previous_summary}\n\n" if previous_summary else ""
+
+        response = await self.client.messages.create(
+            model=self.model,
+            max_tokens=300,
+            system="You summarize language tutoring conversations for the tutor. Be brief and factual.",
+            messages=[{
+                "role": "user",
+                "content": f"{previous}New turns:\n{transcript}\n\nUpdate the summary in under 120 words. Keep topics covered, facts the student shared, and recurring mistakes."
+            }]
+        )
+
         return response.content[0].text
\ No newline at end of file
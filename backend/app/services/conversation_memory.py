@@ -0,0 +1,89 @@
+"""
+Per-connection conversation history and the slice of it sent to the LLM.
+
+Sending the whole history every turn makes input tokens and latency grow
+with session length. The history policy bounds what is sent:
+
+- "full": every message (the old behaviour)
+- "window": only the last history_max_messages messages
+- "summary": the window, plus a rolling summary of everything older
+"""
+import asyncio
+from typing import Optional, get_args
+
+from ..config import HistoryStrategy, settings
+
+
+class ConversationMemory:
+    def __init__(
+            self,
+            conversation_engine,
+            strategy: Optional[HistoryStrategy] = None,
+            max_messages: Optional[int] = None
+    ):
+        if strategy is None:
+            strategy = settings.history_strategy
+        if strategy not in get_args(HistoryStrategy):
+            raise ValueError(f"Unknown history strategy: {strategy}")
+        if max_messages is None:
+            max_messages = settings.history_max_messages
+
+        self.conversation_engine = conversation_engine
+        self.strategy = strategy
+        self.max_messages = max_messages
+
+        self.messages: list[dict] = []
+        self.summary: Optional[str] = None
+        self._summarized = 0  # messages[:_summarized] are folded into summary
+        self._summary_task: Optional[asyncio.Task] = None
+
+    def append(self, role: str, content: str):
+        self.messages.append({"role": role, "content": content})
+
+        if self.strategy == "summary":
+            self._maybe_summarize()
+
+    def context(self) -> tuple[list[dict], Optional[str]]:
+        """Return (messages, summary) to send with the next request."""
+        if self.strategy == "full":
+            return list(self.messages), None
+
+        if self.strategy == "summary":
+            # Everything not yet folded into the summary. This can exceed the
+            # window briefly while a summary is still being written.
+            return self.messages[self._summarized:], self.summary
+
+        return self._from_user_turn(max(0, len(self.messages) - self.max_messages)), None
+
+    def close(self):
+        if self._summary_task is not None:
+            self._summary_task.cancel()
+
+    def _from_user_turn(self, start: int) -> list[dict]:
+        # A window must not open on a tutor reply without the student turn before it
+        while start < len(self.messages) and start > 0 and self.messages[start]["role"] != "user":
+            start += 1
+        return self.messages[start:]
+
+    def _maybe_summarize(self):
+        if self._summary_task is not None and not self._summary_task.done():
+            return
+
+        # Always index a real message, even with a window of 0
+        fold_until = min(len(self.messages) - self.max_messages, len(self.messages) - 1)
+        # Cut on a student turn so the remaining messages open the right way round
+        while fold_until > self._summarized and self.messages[fold_until]["role"] != "user":
+            fold_until -= 1
+        if fold_until <= self._summarized:
+            return
+
+        # Summarize in the background; the next turn uses whatever summary is ready
+        self._summary_task = asyncio.create_task(self._summarize(fold_until))
+
+    async def _summarize(self, fold_until: int):
+        older = self.messages[self._summarized:fold_until]
+        try:
+            self.summary = await self.conversation_engine.summarize_history(older, self.summary)
+            self._summarized = fold_until
+        except Exception as e:
+            print(f"Failed to summarize conversation history: {e}")
@@ -2,8 +2,45 @@
 Mock services for development/testing without hitting real APIs.
 Set USE_MOCK_SERVICES=true in .env to enable.
 """
+import asyncio
+import random
+
+from ..config import settings
+
+
+def sample_latency(spec: str) -> float:
+    """
+    Draw a delay in seconds from a spec like "fixed:0.3", "uniform:0.2,0.6",
+    "normal:0.5,0.1" or "lognormal:-0.7,0.4" (mu and sigma of ln seconds).
+    """
+    if not spec:
+        return 0.0
+
+    kind, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+
+    if kind == "fixed":
+        return values[0]
+    if kind == "uniform":
+        return random.uniform(values[0], values[1])
+    if kind == "normal":
+        return max(0.0, random.gauss(values[0], values[1]))
+    if kind == "lognormal":
+        return random.lognormvariate(values[0], values[1])
+
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+async def simulate_latency(spec: str):
+    delay = sample_latency(spec)
+    if delay:
+        await asyncio.sleep(delay)
+
 
 class MockConversationEngine:
+    provider = "mock"
+    model = "mock-llm"
+
     def build_system_prompt(self, **kwargs) -> str:
         return "mock_system_prompt"
     
@@ -11,8 +48,13 @@ class MockConversationEngine:
         self,
         system_prompt: str,
         conversation_history: list[dict],
-        student_message: str
+        student_message: str,
+        history_summary: str | None = None,
+        usage: dict | None = None
     ) -> str:
+        if usage is not None:
+            usage.update(input_tokens=0, output_tokens=0, cache_read_input_tokens=0, cache_creation_input_tokens=0)
+        await simulate_latency(settings.mock_llm_latency)
         # Return a simple echo response
         responses = [
             "¡Muy bien! Me alegra escucharte.",
@@ -20,15 +62,38 @@ class MockConversationEngine:
             "¡Excelente! Estás progresando mucho.",
             "Entiendo. ¿Y qué piensas sobre eso?",
         ]
-        import random
         return random.choice(responses)
+
+    async def stream_response(
+        self,
+        system_prompt: str,
+        conversation_history: list[dict],
+        student_message: str,
+        history_summary: str | None = None,
+        usage: dict | None = None
+    ):
+        # Stream a canned reply word by word, like the Anthropic text stream
+        response = await self.generate_response(system_prompt, conversation_history, student_message, usage=usage)
+        response += " Cuéntame, ¿qué más te gustaría practicar hoy?"
+        for word in response.split(" "):
+            await asyncio.sleep(0)
+            yield word + " "
     
     async def generate_opening(self, system_prompt: str) -> str:
+        await simulate_latency(settings.mock_llm_latency)
         return "¡Hola! Bienvenido a nuestra conversación. ¿Cómo estás hoy?"
 
+    async def summarize_history(self, messages: list[dict], previous_summary: str | None = None) -> str:
+        earlier = f"{previous_summary} " if previous_summary else ""
+        return f"{earlier}[{len(messages)} earlier messages]"
+
 
 class MockSpeechToTextService:
+    provider = "mock"
+    model = "mock-stt"
+
     async def transcribe(self, audio_data: bytes, language: str = "spanish") -> str:
+        await simulate_latency(settings.mock_stt_latency)
         # Return a fake transcription
         mock_responses = [
             "Hola, estoy bien gracias",
@@ -36,12 +101,16 @@ class MockSpeechToTextService:
             "Quiero aprender más vocabulario",
             "El restaurante tiene buena comida",
         ]
-        import random
         return random.choice(mock_responses)
 
 
 class MockTextToSpeechService:
+    provider = "mock"
+    model = "mock-tts"
+    response_format = "opus"
+
     async def synthesize(self, text: str, voice: str = "nova") -> bytes:
+        await simulate_latency(settings.mock_tts_latency)
         # Return a tiny valid MP3 (silent audio)
         # This is a minimal valid MP3 frame - won't play audibly but won't error
         silent_opus = bytes([
@@ -50,4 +119,31 @@ class MockTextToSpeechService:
                     0x00, 0x00, 0x00, 0x00,
                     0x00, 0x00, 0x00, 0x00,
                 ] * 10)
-        return silent_opus
\ No newline at end of file
+        return silent_opus
+
+
+class MockScoringEngine:
+    provider = "mock"
+    model = "mock-scoring"
+
+    async def analyze_with_ai(
+            self,
+            target_language: str,
+            conversation_turns: list,
+            expected_tenses: list[str],
+            vocabulary: list[str],
+    ) -> dict:
+        await simulate_latency(settings.mock_scoring_latency)
+        return {
+            "vocabulary_usage_score": 0.8,
+            "vocabulary_errors": [],
+            "vocabulary_used": [],
+            "vocabulary_missed": [],
+            "grammar_accuracy_score": 0.75,
+            "grammar_errors": [],
+            "grammar_feedback": "Mock feedback",
+            "tenses_used": [],
+            "verb_tense_accuracy_score": 0.7,
+            "fluency_score": 0.85,
+            "fluency_feedback": "Mock feedback",
+        }
@@ -0,0 +1,98 @@
+"""
+Pre-generated exam openings.
+
+The opening depends only on the exam's conversation_prompt, so it is
+generated (text and audio) in the background when an exam is created or
+assigned, and served straight from the database when a session starts.
+"""
+import asyncio
+import hashlib
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from ..database.database import async_session
+from ..models.exam_opening import ExamOpening
+from .providers import get_conversation_engine, get_text_to_speech_service
+
+# One generation per exam prompt at a time, shared by everyone waiting on it
+_inflight: dict[tuple[UUID, str], asyncio.Task] = {}
+
+
+def prompt_hash(system_prompt: str) -> str:
+    return hashlib.sha256(system_prompt.encode("utf-8")).hexdigest()
+
+
+async def get_exam_opening(exam_id: Optional[UUID], system_prompt: str, replace: bool = False) -> tuple[str, bytes]:
+    """
+    Return (text, audio) for the exam's opening, generating it on demand if needed.
+
+    `system_prompt` must be the exam's stored conversation_prompt. A freshly
+    generated opening is saved only if the exam has none yet; replacing one
+    made from an older prompt is left to prepare_exam_opening (replace=True).
+    """
+    if exam_id is None:
+        return await _synthesize_opening(system_prompt)
+
+    hashed_prompt = prompt_hash(system_prompt)
+    opening = await _load_opening(exam_id, hashed_prompt)
+    if opening:
+        return opening.text, opening.audio
+
+    key = (exam_id, hashed_prompt)
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_synthesize_opening(system_prompt))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+
+    text, audio = await asyncio.shield(task)
+    await _store_opening(exam_id, hashed_prompt, text, audio, replace)
+    return text, audio
+
+
+async def prepare_exam_opening(exam_id: UUID, system_prompt: str):
+    """Background task: make sure the exam has an opening for its current prompt."""
+    try:
+        await get_exam_opening(exam_id, system_prompt, replace=True)
+    except Exception as e:
+        print(f"Failed to pre-generate opening for exam {exam_id}: {e}")
+
+
+async def _synthesize_opening(system_prompt: str) -> tuple[str, bytes]:
+    text = await get_conversation_engine().generate_opening(system_prompt)
+    audio = await get_text_to_speech_service().synthesize(text)
+    return text, audio
+
+
+async def _load_opening(exam_id: UUID, hashed_prompt: str) -> Optional[ExamOpening]:
+    async with async_session() as db:
+        statement = select(ExamOpening).where(
+            ExamOpening.exam_id == exam_id,
+            ExamOpening.prompt_hash == hashed_prompt
+        )
+        return (await db.exec(statement)).first()
+
+
+async def _store_opening(exam_id: UUID, hashed_prompt: str, text: str, audio: bytes, replace: bool):
+    async with async_session() as db:
+        opening = (await db.exec(select(ExamOpening).where(ExamOpening.exam_id == exam_id))).first()
+        if opening is None:
+            opening = ExamOpening(exam_id=exam_id, prompt_hash=hashed_prompt, text=text, audio=audio, audio_format="")
+        elif opening.prompt_hash == hashed_prompt or not replace:
+            return
+
+        # Replaces an opening generated from an older version of the prompt
+        opening.prompt_hash = hashed_prompt
+        opening.text = text
+        opening.audio = audio
+        opening.audio_format = get_text_to_speech_service().response_format
+
+        db.add(opening)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another worker stored an opening for this exam first; keep theirs
+            await db.rollback()
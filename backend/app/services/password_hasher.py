@@ -0,0 +1,54 @@
+"""
+bcrypt off the event loop.
+
+Hashing and checking a password takes a few hundred milliseconds of CPU at
+cost 12. Run in threads, a burst of logins (a class signing in together)
+ties up the default thread pool that other blocking work also needs, so
+they go to a small dedicated process pool, started in the FastAPI lifespan
+and sized by password_hash_workers. With password_hash_workers = 0 they run
+in the default thread pool, as before.
+
+Workers are spawned, which re-imports the main module: a script that starts
+the app itself needs an `if __name__ == "__main__":` guard.
+"""
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from ..config import settings
+from ..utils.password import hash_password, verify_password
+
+
+class PasswordHasher:
+    def __init__(self, workers: Optional[int] = None):
+        self.workers = workers if workers is not None else settings.password_hash_workers
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def start(self):
+        if self.workers > 0 and self._pool is None:
+            # spawn: forking a process that is running an event loop and DB pools is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+
+    def stop(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def _run(self, fn, *args):
+        if self._pool is None:
+            return await asyncio.to_thread(fn, *args)
+        return await asyncio.get_running_loop().run_in_executor(self._pool, fn, *args)
+
+    async def hash(self, plain_password: str) -> str:
+        # Resolve the cost here so workers don't depend on their own copy of the settings
+        return await self._run(hash_password, plain_password, settings.password_hash_rounds)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        return await self._run(verify_password, plain_password, hashed_password)
+
+
+password_hasher = PasswordHasher()
@@ -0,0 +1,56 @@
+"""
+Shared service instances.
+
+Picks the mock or real implementation once, based on USE_MOCK_SERVICES, so the
+WebSocket handler and background work use the same services and TTS cache.
+Services are built on first use, not at import, and the provider SDK clients
+they wrap are only created when a real service first calls out.
+"""
+from functools import lru_cache
+
+from ..config import settings
+from .tts_cache import CachedTextToSpeechService
+
+if settings.use_mock_services:
+    from .mock_services import (
+        MockConversationEngine as ConversationEngine,
+        MockSpeechToTextService as SpeechToTextService,
+        MockTextToSpeechService as TextToSpeechService,
+        MockScoringEngine as ScoringEngine,
+    )
+else:
+    from .conversation_engine import ConversationEngine
+    from .speech_to_text import SpeechToTextService
+    from .text_to_speech import TextToSpeechService
+    from .scoring_engine import ScoringEngine
+
+
+@lru_cache
+def get_conversation_engine() -> ConversationEngine:
+    # Real services share the provider clients opened in the app lifespan
+    return ConversationEngine()
+
+
+@lru_cache
+def get_prompt_builder():
+    # Exam prompts are built locally, so the real engine is used even with mock services
+    from .conversation_engine import ConversationEngine as PromptBuilder
+    return PromptBuilder()
+
+
+@lru_cache
+def get_speech_to_text_service() -> SpeechToTextService:
+    return SpeechToTextService()
+
+
+@lru_cache
+def get_scoring_engine() -> ScoringEngine:
+    return ScoringEngine()
+
+
+@lru_cache
+def get_text_to_speech_service() -> TextToSpeechService | CachedTextToSpeechService:
+    tts_service = TextToSpeechService()
+    if settings.tts_cache_enabled:
+        tts_service = CachedTextToSpeechService(tts_service)
+    return tts_service
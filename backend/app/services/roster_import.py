@@ -0,0 +1,167 @@
+"""
+Bulk roster import: create a teacher's students in one request.
+
+Rows are validated first, then every email is looked up in one query.
+Unknown students are created with multi-row INSERTs, with the
+passwords hashed concurrently in the password_hasher process pool. Existing
+accounts are never taken over: linking one to a teacher would expose its
+sessions and scores without the student's consent, so they are reported as
+conflicts. Every row gets a result, so the teacher can see exactly what
+happened to each student.
+
+Emails are compared case-insensitively and new accounts are stored in
+lowercase.
+"""
+import asyncio
+import secrets
+from datetime import datetime, timezone
+from typing import AsyncIterator, Optional
+from uuid import uuid4
+
+from fastapi import UploadFile
+from pydantic import EmailStr, TypeAdapter, ValidationError
+from sqlalchemy import func
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import settings
+from ..database.database import dialect_insert
+from ..models.user import RosterImportResponse, RosterRowResult, RosterStudent, User
+from ..utils.csv_stream import iter_csv_rows
+from .password_hasher import password_hasher
+
+# Rows per INSERT / IN (...) list; keeps bind parameters well under driver limits
+BATCH_SIZE = 500
+
+email_adapter = TypeAdapter(EmailStr)
+
+
+async def iter_roster_rows(file: UploadFile) -> AsyncIterator[tuple[int, RosterStudent]]:
+    """Yield (row_number, student) from a roster CSV with email, first_name and last_name columns."""
+    rows = iter_csv_rows(
+        file,
+        required=("email", "first_name", "last_name"),
+        max_rows=settings.roster_import_max_rows,
+        max_bytes=settings.vocabulary_import_max_bytes,
+        chunk_size=settings.vocabulary_import_chunk_bytes,
+    )
+    async for row_number, row in rows:
+        def value(key: str) -> Optional[str]:
+            return (row.get(key) or "").strip() or None
+
+        yield row_number, RosterStudent(
+            email=value("email") or "",
+            first_name=value("first_name") or "",
+            last_name=value("last_name") or "",
+            password=value("password"),
+            native_language=value("native_language"),
+            target_language=value("target_language"),
+        )
+
+
+def _validate(student: RosterStudent) -> Optional[str]:
+    """Why the row can't be imported, or None."""
+    if not student.first_name.strip() or not student.last_name.strip():
+        return "first_name and last_name are required"
+    try:
+        email_adapter.validate_python(student.email)
+    except ValidationError:
+        return "invalid email address"
+    return None
+
+
+async def import_roster(
+        db: AsyncSession,
+        teacher: User,
+        rows: list[tuple[int, RosterStudent]]
+) -> RosterImportResponse:
+    """Create the students in `rows`, given as (row_number, student), and report on each."""
+    numbers = [row_number for row_number, _ in rows]
+    students = [student for _, student in rows]
+    results: list[Optional[RosterRowResult]] = [None] * len(students)
+    pending: dict[str, int] = {}  # email -> index of the row that will create it
+
+    def result(i: int, status: str, **fields) -> RosterRowResult:
+        return RosterRowResult(row=numbers[i], email=students[i].email, status=status, **fields)
+
+    for i, student in enumerate(students):
+        student.email = student.email.strip().lower()
+        error = _validate(student)
+        if error:
+            results[i] = result(i, "invalid", message=error)
+        elif student.email in pending:
+            results[i] = result(i, "duplicate", message=f"same email as row {numbers[pending[student.email]]}")
+        else:
+            pending[student.email] = i
+
+    # Existing accounts, in one query per batch
+    emails = list(pending)
+    existing: dict[str, User] = {}
+    for start in range(0, len(emails), BATCH_SIZE):
+        # Accounts created before emails were normalized may have mixed case
+        statement = select(User).where(func.lower(User.email).in_(emails[start:start + BATCH_SIZE]))
+        for user in (await db.exec(statement)).all():
+            existing[user.email.lower()] = user
+
+    to_create = []
+    for email, i in pending.items():
+        user = existing.get(email)
+        if user is None:
+            to_create.append(i)
+        elif user.role == "student" and user.teacher_id == teacher.id:
+            results[i] = result(i, "already_linked", user_id=user.id)
+        else:
+            results[i] = result(
+                i, "conflict",
+                message="an account with this email already exists",
+            )
+
+    # New students: hash concurrently across the pool's processes, then insert in bulk
+    temporary = {i: secrets.token_urlsafe(9) for i in to_create if not students[i].password}
+    hashes = await asyncio.gather(*(
+        password_hasher.hash(students[i].password or temporary[i]) for i in to_create
+    ))
+
+    now = datetime.now(timezone.utc)
+    new_rows = [
+        {
+            "id": uuid4(),
+            "email": students[i].email,
+            "password_hash": password_hash,
+            "first_name": students[i].first_name.strip(),
+            "last_name": students[i].last_name.strip(),
+            "role": "student",
+            "native_language": students[i].native_language,
+            "target_language": students[i].target_language,
+            "teacher_id": teacher.id,
+            "created_at": now,
+        }
+        for i, password_hash in zip(to_create, hashes)
+    ]
+
+    created = {}
+    for start in range(0, len(new_rows), BATCH_SIZE):
+        # An email registered since the lookup above is skipped, not an error
+        statement = (
+            dialect_insert(db, User)
+            .values(new_rows[start:start + BATCH_SIZE])
+            .on_conflict_do_nothing(index_elements=["email"])
+            .returning(User.id, User.email)
+        )
+        created.update({email: user_id for user_id, email in (await db.execute(statement)).all()})
+
+    await db.commit()
+
+    for i in to_create:
+        email = students[i].email
+        if email in created:
+            results[i] = result(i, "created", user_id=created[email], temporary_password=temporary.get(i))
+        else:
+            results[i] = result(i, "conflict", message="email registered during import")
+
+    created_count = sum(1 for r in results if r.status == "created")
+    return RosterImportResponse(
+        created=created_count,
+        skipped=len(results) - created_count,
+        results=results,
+    )
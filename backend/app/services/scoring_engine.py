@@ -1,12 +1,24 @@
-import anthropic
 import json
 import re
+from typing import Optional, TYPE_CHECKING
+
+from .clients import provider_clients
+
+if TYPE_CHECKING:
+    import anthropic
 
 class ScoringEngine:
-    def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    provider = "anthropic"
+    model = "claude-sonnet-4-20250514"
+
+    def __init__(self, client: Optional["anthropic.AsyncAnthropic"] = None):
+        self._client = client
+
+    @property
+    def client(self) -> "anthropic.AsyncAnthropic":
+        return self._client or provider_clients.anthropic
 
-    def analyze_with_ai(
+    async def analyze_with_ai(
             self,
             target_language: str,
             conversation_turns: list,
@@ -50,8 +62,8 @@ class ScoringEngine:
 
 """
         # 2. Call Claude
-        response = self.client.messages.create(
-            model="claude-sonnet-4-20250514",
+        response = await self.client.messages.create(
+            model=self.model,
             max_tokens=500,
             system=system,
             messages=[{"role": "user", "content": user_message}]
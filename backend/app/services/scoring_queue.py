@@ -0,0 +1,247 @@
+"""
+Background scoring jobs.
+
+Ending a session only enqueues a ScoringJob; a bounded pool of workers runs
+the Sonnet scoring call off the request path, retrying with exponential
+backoff. Job state is persisted in scoring_jobs, so jobs left queued by a
+restart, or running with an expired lease, are picked up again on startup
+and by a periodic sweep.
+
+Several processes may hold the same job in their queues; a worker only runs
+it after claiming it with a conditional UPDATE, so each session is scored
+once. A claimed job stays running, its lease renewed by every update, until
+it is done or failed.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from uuid import UUID
+
+from sqlalchemy import and_, or_, update
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import select
+
+from ..config import settings
+from ..database.database import async_session
+from ..models.scoring_job import ScoringJob, ScoringJobStatus
+from ..models.session_score import SessionScore
+from ..utils.score_session import generate_session_score
+
+
+class ScoringQueue:
+    def __init__(self):
+        self._queue: asyncio.Queue[UUID] = asyncio.Queue()
+        self._workers: list[asyncio.Task] = []
+        self._pending: set[UUID] = set()
+        self._waiters: dict[UUID, list[asyncio.Future]] = {}
+
+    async def start(self):
+        for session_id in await self._recover_jobs():
+            self._submit(session_id)
+
+        for i in range(settings.scoring_workers):
+            self._workers.append(asyncio.create_task(self._work(), name=f"scoring-worker-{i}"))
+        self._workers.append(asyncio.create_task(self._sweep(), name="scoring-sweep"))
+
+    async def stop(self):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers.clear()
+
+    async def enqueue(self, session_id: UUID) -> ScoringJob:
+        """
+        Queue scoring for a session and return its job.
+
+        Idempotent per session: a job that is already queued, running or done is
+        returned as-is; only a failed job is re-queued.
+        """
+        job, submit = await self._get_or_create_job(session_id)
+        if submit:
+            self._submit(session_id)
+        return job
+
+    async def wait_for(self, session_id: UUID, timeout: float) -> Optional[SessionScore]:
+        """Wait until the session's job finishes and return its score, or None."""
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(session_id, []).append(future)
+
+        # The job may have finished before we started listening
+        job = await self._get_job(session_id)
+        if job and job.status in (ScoringJobStatus.done, ScoringJobStatus.failed):
+            self._resolve(session_id, await self._get_score(session_id))
+
+        try:
+            return await asyncio.wait_for(future, timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            waiters = self._waiters.get(session_id, [])
+            if future in waiters:
+                waiters.remove(future)
+            if not waiters:
+                self._waiters.pop(session_id, None)
+
+    def _submit(self, session_id: UUID):
+        if session_id not in self._pending:
+            self._pending.add(session_id)
+            self._queue.put_nowait(session_id)
+
+    async def _work(self):
+        while True:
+            session_id = await self._queue.get()
+            try:
+                await self._run(session_id)
+            except Exception as e:
+                print(f"Scoring job for session {session_id} crashed: {e}")
+            finally:
+                self._pending.discard(session_id)
+                self._queue.task_done()
+
+    async def _sweep(self):
+        """Periodically re-queue jobs whose worker died without finishing them, e.g. in another process."""
+        while True:
+            await asyncio.sleep(settings.scoring_sweep_interval_seconds)
+            try:
+                for session_id in await self._recover_jobs():
+                    self._submit(session_id)
+            except Exception as e:
+                print(f"Scoring job sweep failed: {e}")
+
+    async def _run(self, session_id: UUID):
+        score = await self._get_score(session_id)
+        if score:
+            # Already scored, e.g. by an earlier attempt that died before updating the job
+            await self._update_job(session_id, ScoringJobStatus.done)
+            self._resolve(session_id, score)
+            return
+
+        attempt = await self._claim(session_id)
+        if attempt is None:
+            # Another worker has it, or it already finished
+            return
+
+        while True:
+            try:
+                scores_dict = await generate_session_score(conversation_session_id=str(session_id))
+                if scores_dict is None:
+                    raise ValueError("Failed to parse scoring response from AI")
+            except Exception as e:
+                print(f"Scoring attempt {attempt} for session {session_id} failed: {e}")
+                if attempt >= settings.scoring_max_attempts:
+                    await self._update_job(session_id, ScoringJobStatus.failed, error=str(e))
+                    self._resolve(session_id, None)
+                    return
+
+                # Stays running through the backoff so no other worker claims it meanwhile
+                await self._update_job(session_id, ScoringJobStatus.running, error=str(e))
+                await asyncio.sleep(settings.scoring_retry_backoff_seconds * 2 ** (attempt - 1))
+                attempt += 1
+                await self._update_job(session_id, ScoringJobStatus.running, attempts=attempt)
+                continue
+
+            await self._update_job(session_id, ScoringJobStatus.done)
+            self._resolve(session_id, await self._get_score(session_id))
+            return
+
+    def _resolve(self, session_id: UUID, score: Optional[SessionScore]):
+        for future in self._waiters.pop(session_id, []):
+            if not future.done():
+                future.set_result(score)
+
+    @staticmethod
+    def _claimable():
+        """Queued jobs, and running ones whose worker stopped renewing the lease."""
+        lease_expired = datetime.now(timezone.utc) - timedelta(seconds=settings.scoring_job_lease_seconds)
+        return or_(
+            ScoringJob.status == ScoringJobStatus.queued,
+            and_(
+                ScoringJob.status == ScoringJobStatus.running,
+                or_(ScoringJob.updated_at.is_(None), ScoringJob.updated_at < lease_expired),
+            ),
+        )
+
+    async def _claim(self, session_id: UUID) -> Optional[int]:
+        """Mark the job running if it is claimable; returns its attempt number, or None if it wasn't."""
+        async with async_session() as db:
+            statement = (
+                update(ScoringJob)
+                .where(ScoringJob.session_id == session_id, self._claimable())
+                .values(
+                    status=ScoringJobStatus.running,
+                    attempts=ScoringJob.attempts + 1,
+                    updated_at=datetime.now(timezone.utc),
+                )
+                .returning(ScoringJob.attempts)
+            )
+            attempts = (await db.execute(statement)).scalar_one_or_none()
+            await db.commit()
+            return attempts
+
+    async def _recover_jobs(self) -> list[UUID]:
+        async with async_session() as db:
+            statement = select(ScoringJob.session_id).where(self._claimable())
+            return list((await db.exec(statement)).all())
+
+    async def _get_job(self, session_id: UUID) -> Optional[ScoringJob]:
+        async with async_session() as db:
+            return (await db.exec(select(ScoringJob).where(ScoringJob.session_id == session_id))).first()
+
+    async def _get_or_create_job(self, session_id: UUID) -> tuple[ScoringJob, bool]:
+        async with async_session() as db:
+            job = (await db.exec(select(ScoringJob).where(ScoringJob.session_id == session_id))).first()
+
+            if job and job.status != ScoringJobStatus.failed:
+                return job, job.status == ScoringJobStatus.queued
+
+            if job:
+                job.status = ScoringJobStatus.queued
+                job.attempts = 0
+                job.last_error = None
+                job.updated_at = datetime.now(timezone.utc)
+            else:
+                job = ScoringJob(session_id=session_id)
+
+            db.add(job)
+            try:
+                await db.commit()
+            except IntegrityError:
+                # A concurrent enqueue for the same session won the insert
+                await db.rollback()
+                job = (await db.exec(select(ScoringJob).where(ScoringJob.session_id == session_id))).one()
+                return job, False
+
+            await db.refresh(job)
+            return job, True
+
+    async def _update_job(
+            self,
+            session_id: UUID,
+            status: ScoringJobStatus,
+            attempts: Optional[int] = None,
+            error: Optional[str] = None
+    ):
+        async with async_session() as db:
+            job = (await db.exec(select(ScoringJob).where(ScoringJob.session_id == session_id))).first()
+            if not job:
+                return
+
+            now = datetime.now(timezone.utc)
+            job.status = status
+            job.updated_at = now
+            if attempts is not None:
+                job.attempts = attempts
+            if error is not None:
+                job.last_error = error
+            if status in (ScoringJobStatus.done, ScoringJobStatus.failed):
+                job.finished_at = now
+
+            db.add(job)
+            await db.commit()
+
+    async def _get_score(self, session_id: UUID) -> Optional[SessionScore]:
+        async with async_session() as db:
+            return (await db.exec(select(SessionScore).where(SessionScore.session_id == session_id))).first()
+
+
+scoring_queue = ScoringQueue()
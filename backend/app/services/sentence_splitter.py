@@ -0,0 +1,69 @@
+"""
+Cut a streamed LLM reply into sentences so each one can be synthesized
+as soon as it is complete.
+"""
+import re
+from typing import AsyncIterator, Optional
+
+# Sentence-ending punctuation, optionally followed by closing quotes/brackets,
+# and then whitespace. The whitespace requirement keeps "3.5" or "Sr.Pérez"
+# from being split mid-token while the stream is still arriving.
+SENTENCE_END = re.compile(r"[.!?…]+[\"'”»)\]]*\s+")
+
+# Abbreviations whose period is not a sentence end, per target language
+# (lowercase, with the period). Splitting on "Sr. Pérez" would put an audible
+# pause in the middle of a name. Words that usually end a sentence, like
+# "etc.", are left out.
+ABBREVIATIONS = {
+    "spanish": frozenset({
+        "sr.", "sra.", "srta.", "sres.", "dr.", "dra.", "prof.", "profa.", "lic.", "ing.",
+        "ud.", "uds.", "d.", "dña.", "av.", "avda.", "núm.", "pág.", "p.", "ej.", "aprox.", "ee.uu.",
+    }),
+    "french": frozenset({"m.", "mme.", "mlle.", "mm.", "dr.", "pr.", "st.", "ste.", "av.", "bd.", "p.", "ex."}),
+    "german": frozenset({"hr.", "fr.", "dr.", "prof.", "z.b.", "bzw.", "ca.", "nr.", "str.", "d.h."}),
+    "italian": frozenset({"sig.", "sigg.", "dott.", "prof.", "ing.", "avv.", "p.es.", "ecc."}),
+    "portuguese": frozenset({"sr.", "sra.", "srta.", "dr.", "dra.", "prof.", "profa.", "av.", "d.", "p.", "ex."}),
+    "english": frozenset({"mr.", "mrs.", "ms.", "dr.", "prof.", "st.", "jr.", "sr.", "e.g.", "i.e.", "vs."}),
+}
+
+# Fragments shorter than this are merged into the next sentence, so
+# "¡Sí! Claro." is synthesized as one request instead of two tiny ones.
+MIN_SENTENCE_LENGTH = 12
+
+
+def _ends_with_abbreviation(text: str, abbreviations: frozenset[str]) -> bool:
+    words = text.split()
+    return bool(words) and f"{words[-1].lower()}." in abbreviations
+
+
+async def split_sentences(
+    text_stream: AsyncIterator[str],
+    min_length: int = MIN_SENTENCE_LENGTH,
+    language: Optional[str] = None,
+) -> AsyncIterator[str]:
+    abbreviations = ABBREVIATIONS.get((language or "").lower(), frozenset())
+    buffer = ""
+
+    async for delta in text_stream:
+        buffer += delta
+
+        while True:
+            cut = None
+            for match in SENTENCE_END.finditer(buffer):
+                if match.group().strip() == "." and _ends_with_abbreviation(buffer[:match.start()], abbreviations):
+                    continue
+                if match.end() >= min_length:
+                    cut = match.end()
+                    break
+
+            if cut is None:
+                break
+
+            sentence = buffer[:cut].strip()
+            buffer = buffer[cut:]
+            if sentence:
+                yield sentence
+
+    remainder = buffer.strip()
+    if remainder:
+        yield remainder
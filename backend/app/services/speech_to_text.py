@@ -1,9 +1,21 @@
-import openai
 from io import BytesIO
+from typing import Optional, TYPE_CHECKING
+
+from .clients import provider_clients
+
+if TYPE_CHECKING:
+    import openai
 
 class SpeechToTextService:
-    def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
+    provider = "openai"
+    model = "whisper-1"
+
+    def __init__(self, client: Optional["openai.AsyncOpenAI"] = None):
+        self._client = client
+
+    @property
+    def client(self) -> "openai.AsyncOpenAI":
+        return self._client or provider_clients.openai
     
     # Map full language names to ISO codes
     LANGUAGE_CODES = {
@@ -27,8 +39,8 @@ class SpeechToTextService:
         
         lang_code = self.LANGUAGE_CODES.get(language.lower(), language[:2].lower())
         
-        transcript = self.client.audio.transcriptions.create(
-            model="whisper-1",
+        transcript = await self.client.audio.transcriptions.create(
+            model=self.model,
             file=audio_file,
             language=lang_code,
             response_format="text"
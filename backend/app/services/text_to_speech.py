@@ -1,20 +1,32 @@
-import openai
-from typing import Literal
+from typing import Literal, Optional, TYPE_CHECKING
+
+from .clients import provider_clients
+
+if TYPE_CHECKING:
+    import openai
 
 class TextToSpeechService:
-    def __init__(self, api_key: str):
-        self.client = openai.OpenAI(api_key=api_key)
+    provider = "openai"
+    model = "gpt-4o-mini-tts"
+    response_format = "opus"
+
+    def __init__(self, client: Optional["openai.AsyncOpenAI"] = None):
+        self._client = client
+
+    @property
+    def client(self) -> "openai.AsyncOpenAI":
+        return self._client or provider_clients.openai
     
     async def synthesize(
         self,
         text: str,
         voice: Literal["alloy", "echo", "fable", "onyx", "nova", "shimmer"] = "nova",
     ) -> bytes:
-        response = self.client.audio.speech.create(
-            model="gpt-4o-mini-tts",
+        response = await self.client.audio.speech.create(
+            model=self.model,
             voice=voice,
             input=text,
-            response_format="opus"
+            response_format=self.response_format
         )
         
         return response.content
\ No newline at end of file
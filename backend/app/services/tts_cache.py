@@ -0,0 +1,191 @@
+"""
+Content-addressed cache in front of a text-to-speech service.
+
+Audio is keyed by (text, voice, model, format). Lookups go to an in-memory
+LRU first, then to files on disk, and only then to the provider. Concurrent
+requests for the same key share one upstream call.
+"""
+import asyncio
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Optional
+
+from ..config import settings
+from ..utils.metrics import metrics
+
+TTS_CACHE_REQUESTS = metrics.counter(
+    "gato_tts_cache_requests_total",
+    "TTS cache lookups by result (memory_hit, disk_hit, coalesced, miss)",
+    ("result",),
+)
+
+# Disk eviction frees space down to this fraction of the cap, so the
+# directory walk it needs happens once per batch of writes, not per miss
+DISK_LOW_WATER = 0.9
+
+
+def cache_key(text: str, voice: str, model: str, response_format: str) -> str:
+    payload = "\x1f".join([model, voice, response_format, text])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedTextToSpeechService:
+    def __init__(
+            self,
+            service,
+            memory_max_bytes: Optional[int] = None,
+            disk_dir: Optional[str] = None,
+            disk_max_bytes: Optional[int] = None
+    ):
+        self.service = service
+        self.provider = service.provider
+        self.model = service.model
+        self.response_format = service.response_format
+
+        self.memory_max_bytes = memory_max_bytes if memory_max_bytes is not None else settings.tts_cache_memory_max_bytes
+        self.disk_dir = disk_dir if disk_dir is not None else settings.tts_cache_dir
+        self.disk_max_bytes = disk_max_bytes if disk_max_bytes is not None else settings.tts_cache_disk_max_bytes
+
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def synthesize(self, text: str, voice: str = "nova") -> bytes:
+        key = cache_key(text, voice, self.model, self.response_format)
+
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            TTS_CACHE_REQUESTS.inc(result="memory_hit")
+            return audio
+
+        task = self._inflight.get(key)
+        if task is not None:
+            TTS_CACHE_REQUESTS.inc(result="coalesced")
+        else:
+            task = asyncio.create_task(self._load(key, text, voice))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+
+        # Shielded so one caller disconnecting doesn't cancel the call for the others
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        return {
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_bytes": self._disk_bytes or 0,
+            **{
+                result: int(TTS_CACHE_REQUESTS.value(result=result))
+                for result in ("memory_hit", "disk_hit", "coalesced", "miss")
+            },
+        }
+
+    async def _load(self, key: str, text: str, voice: str) -> bytes:
+        if self.disk_dir:
+            audio = await asyncio.to_thread(self._disk_get, key)
+            if audio is not None:
+                TTS_CACHE_REQUESTS.inc(result="disk_hit")
+                self._memory_put(key, audio)
+                return audio
+
+        TTS_CACHE_REQUESTS.inc(result="miss")
+        audio = await self.service.synthesize(text, voice)
+
+        self._memory_put(key, audio)
+        if self.disk_dir:
+            try:
+                await asyncio.to_thread(self._disk_put, key, audio)
+            except OSError as e:
+                print(f"Failed to write TTS cache entry {key}: {e}")
+        return audio
+
+    def _memory_put(self, key: str, audio: bytes):
+        if len(audio) > self.memory_max_bytes:
+            return
+
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+
+        self._memory[key] = audio
+        self._memory_bytes += len(audio)
+
+        while self._memory_bytes > self.memory_max_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+
+    def _disk_path(self, key: str) -> str:
+        # Two-level fan-out keeps directories small
+        return os.path.join(self.disk_dir, key[:2], f"{key}.{self.response_format}")
+
+    def _disk_get(self, key: str) -> Optional[bytes]:
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                audio = f.read()
+        except FileNotFoundError:
+            return None
+
+        # Bump mtime so eviction is least-recently-used rather than oldest-written
+        os.utime(path)
+        return audio
+
+    def _disk_put(self, key: str, audio: bytes):
+        path = self._disk_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(audio)
+
+        # Another process, or an earlier miss for the same text, may have written this key already
+        try:
+            replaced = os.path.getsize(path)
+        except FileNotFoundError:
+            replaced = 0
+        os.replace(tmp_path, path)
+
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(os.path.getsize(p) for p, _ in self._disk_entries())
+        else:
+            self._disk_bytes += len(audio) - replaced
+
+        if self._disk_bytes > self.disk_max_bytes:
+            self._evict_disk()
+
+    def _disk_entries(self) -> list[tuple[str, float]]:
+        entries = []
+        for root, _, files in os.walk(self.disk_dir):
+            for name in files:
+                if name.endswith(".tmp"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    entries.append((path, os.path.getmtime(path)))
+                except FileNotFoundError:
+                    continue
+        return entries
+
+    def _evict_disk(self):
+        target = int(self.disk_max_bytes * DISK_LOW_WATER)
+        total = 0
+        entries = sorted(self._disk_entries(), key=lambda entry: entry[1], reverse=True)
+        for path, _ in entries:
+            try:
+                size = os.path.getsize(path)
+            except FileNotFoundError:
+                continue
+
+            if total + size <= target:
+                total += size
+                continue
+
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+        self._disk_bytes = total
@@ -0,0 +1,94 @@
+"""
+Write-behind persistence for conversation turns.
+
+Each WebSocket connection gets one TurnWriter. Turns are buffered in memory
+and inserted in batches off the turn pipeline, through a single DB session
+that lives as long as the connection.
+"""
+import asyncio
+from typing import Optional
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import settings
+from ..database.database import async_session
+from ..models.conversation_turn import ConversationTurn
+
+
+class TurnWriter:
+    def __init__(
+            self,
+            batch_size: Optional[int] = None,
+            flush_interval: Optional[float] = None
+    ):
+        self.batch_size = batch_size or settings.turn_flush_size
+        self.flush_interval = flush_interval or settings.turn_flush_interval_seconds
+
+        self._buffer: list[ConversationTurn] = []
+        self._lock = asyncio.Lock()
+        self._db: Optional[AsyncSession] = None
+        self._timer: Optional[asyncio.Task] = None
+
+    def add(self, turn: ConversationTurn):
+        """Buffer a turn; it is written once the batch fills up or the timer fires."""
+        self._buffer.append(turn)
+
+        if len(self._buffer) >= self.batch_size:
+            self._schedule_flush(0)
+        elif self._timer is None:
+            self._schedule_flush(self.flush_interval)
+
+    async def flush(self):
+        """Write everything buffered so far, in turn_number order."""
+        async with self._lock:
+            if not self._buffer:
+                return
+
+            batch = sorted(self._buffer, key=lambda turn: turn.turn_number)
+            self._buffer = []
+
+            try:
+                await self._write(batch)
+            except Exception:
+                # Keep the batch ahead of anything buffered since, so ordering holds on retry
+                self._buffer = batch + self._buffer
+                raise
+
+    async def close(self):
+        """Flush remaining turns and release the connection's DB session."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        try:
+            await self.flush()
+        finally:
+            if self._db is not None:
+                await self._db.close()
+                self._db = None
+
+    def _schedule_flush(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.create_task(self._flush_later(delay))
+
+    async def _flush_later(self, delay: float):
+        await asyncio.sleep(delay)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"Failed to write conversation turns, will retry: {e}")
+            if self._timer is None:
+                self._schedule_flush(self.flush_interval)
+
+    async def _write(self, batch: list[ConversationTurn]):
+        if self._db is None:
+            self._db = async_session()
+
+        try:
+            self._db.add_all(batch)
+            await self._db.commit()
+        except Exception:
+            await self._db.rollback()
+            raise
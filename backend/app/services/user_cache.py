@@ -0,0 +1,145 @@
+"""
+Short-lived cache of authenticated users.
+
+get_current_user runs on nearly every request, and without this every one
+of them starts with a SELECT on users. The JWT is still verified on each
+request; only the user lookup is cached, keyed by user id, for
+auth_user_cache_ttl_seconds. Anything that changes a user row (profile
+update, password reset, deletion) must call user_cache.invalidate so the
+password_changed_at and role checks never run against a stale copy.
+
+Entries live in process memory by default. With several workers, set
+auth_user_cache_url to a Redis URL (needs the optional `redis` package) so
+an invalidation on one worker is seen by all of them.
+"""
+import json
+import time
+from collections import OrderedDict
+from typing import Optional
+from uuid import UUID
+
+from ..config import settings
+from ..models.user import User
+from ..utils.metrics import metrics
+
+USER_CACHE_REQUESTS = metrics.counter(
+    "gato_auth_user_cache_requests_total",
+    "Authenticated user lookups by result (hit, miss, error)",
+    ("result",),
+)
+USER_CACHE_INVALIDATIONS = metrics.counter(
+    "gato_auth_user_cache_invalidations_total",
+    "Cached users dropped because the user row changed",
+)
+
+# Secrets that no request handler needs from current_user
+SNAPSHOT_EXCLUDE = {"password_reset_token", "password_reset_expires"}
+
+
+class MemoryBackend:
+    """Per-process LRU with expiry."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[dict]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, data = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return data
+
+    async def set(self, key: str, data: dict, ttl: float):
+        self._entries[key] = (time.monotonic() + ttl, data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def delete(self, key: str):
+        self._entries.pop(key, None)
+
+
+class RedisBackend:
+    """Shared between workers, so invalidations reach every process."""
+
+    def __init__(self, url: str):
+        import redis.asyncio as redis
+
+        self.client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[dict]:
+        raw = await self.client.get(key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, data: dict, ttl: float):
+        await self.client.set(key, json.dumps(data), ex=max(1, int(ttl)))
+
+    async def delete(self, key: str):
+        await self.client.delete(key)
+
+
+class UserCache:
+    def __init__(self, backend=None, ttl: Optional[float] = None):
+        self._backend = backend
+        self.ttl = ttl if ttl is not None else settings.auth_user_cache_ttl_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    @property
+    def backend(self):
+        if self._backend is None:
+            if settings.auth_user_cache_url:
+                self._backend = RedisBackend(settings.auth_user_cache_url)
+            else:
+                self._backend = MemoryBackend(settings.auth_user_cache_max_entries)
+        return self._backend
+
+    @staticmethod
+    def _key(user_id: UUID) -> str:
+        return f"auth:user:{user_id}"
+
+    async def get(self, user_id: UUID) -> Optional[User]:
+        """A detached copy of the cached user, or None on a miss."""
+        if not self.enabled:
+            return None
+
+        try:
+            data = await self.backend.get(self._key(user_id))
+        except Exception as e:
+            # A cache outage shouldn't take auth down with it; fall back to the database
+            print(f"User cache lookup failed: {e}")
+            USER_CACHE_REQUESTS.inc(result="error")
+            return None
+
+        USER_CACHE_REQUESTS.inc(result="hit" if data else "miss")
+        return User.model_validate(data) if data else None
+
+    async def set(self, user: User):
+        if not self.enabled:
+            return
+
+        try:
+            await self.backend.set(self._key(user.id), user.model_dump(mode="json", exclude=SNAPSHOT_EXCLUDE), self.ttl)
+        except Exception as e:
+            print(f"User cache store failed: {e}")
+
+    async def invalidate(self, user_id: UUID):
+        if not self.enabled:
+            return
+
+        USER_CACHE_INVALIDATIONS.inc()
+        try:
+            await self.backend.delete(self._key(user_id))
+        except Exception as e:
+            # The entry still expires after ttl seconds
+            print(f"User cache invalidation failed for {user_id}: {e}")
+
+
+user_cache = UserCache()
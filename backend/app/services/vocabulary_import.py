@@ -0,0 +1,53 @@
+"""
+Parsing of vocabulary CSV uploads.
+
+Built on utils.csv_stream, so a preview never holds more of the file in
+memory than one chunk plus the rows parsed so far.
+"""
+from typing import AsyncIterator, Optional
+
+from fastapi import UploadFile
+
+from ..config import settings
+from ..utils.csv_stream import iter_csv_rows
+
+
+def parse_item(row: dict) -> Optional[dict]:
+    """A vocabulary item from a CSV row, or None if a required field is missing."""
+    def value(key: str) -> str:
+        return (row.get(key) or "").strip()
+
+    if not value("word") or not value("translation"):
+        return None
+
+    return {
+        "word": value("word"),
+        "translation": value("translation"),
+        "part_of_speech": value("part_of_speech") or None,
+        "example_sentence": value("example_sentence") or None,
+        "regional_notes": value("regional_notes") or None,
+    }
+
+
+async def iter_vocabulary_rows(
+        file: UploadFile,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        chunk_size: Optional[int] = None
+) -> AsyncIterator[tuple[int, Optional[dict]]]:
+    """
+    Yield (row_number, item) for each data row of a vocabulary CSV.
+
+    item is None for rows missing a word or translation. Row numbers start at
+    1 for the first row after the header. Raises CsvImportTooLarge when a
+    limit is exceeded and CsvImportError when the file can't be read.
+    """
+    rows = iter_csv_rows(
+        file,
+        required=("word", "translation"),
+        max_rows=max_rows or settings.vocabulary_import_max_rows,
+        max_bytes=max_bytes or settings.vocabulary_import_max_bytes,
+        chunk_size=chunk_size or settings.vocabulary_import_chunk_bytes,
+    )
+    async for row_number, row in rows:
+        yield row_number, parse_item(row)
@@ -0,0 +1,165 @@
+"""
+Streaming CSV parsing for uploads.
+
+The upload is read in chunks and decoded incrementally, so memory stays
+bounded by the chunk size and the caller's limits rather than the file
+size. The encoding is taken from a byte-order mark when there is one,
+otherwise UTF-8, falling back to Windows-1252 (Excel's usual export) when
+the start of the file isn't valid UTF-8.
+"""
+import codecs
+import csv
+from collections import deque
+from typing import AsyncIterator
+
+from fastapi import UploadFile
+
+BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16-le"),
+    (codecs.BOM_UTF16_BE, "utf-16-be"),
+)
+FALLBACK_ENCODING = "cp1252"
+
+
+class CsvImportError(ValueError):
+    """The upload can't be imported at all (undecodable, no header)."""
+
+
+class CsvImportTooLarge(CsvImportError):
+    """The upload exceeds the configured byte or row limit."""
+
+
+def detect_encoding(head: bytes) -> tuple[str, int]:
+    """Return (encoding, BOM length) for the first chunk of an upload."""
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding, len(bom)
+
+    try:
+        # final=False: a multi-byte character may be cut off at the end of the chunk
+        codecs.getincrementaldecoder("utf-8")().decode(head, final=False)
+        return "utf-8", 0
+    except UnicodeDecodeError:
+        return FALLBACK_ENCODING, 0
+
+
+async def iter_text(file: UploadFile, chunk_size: int, max_bytes: int) -> AsyncIterator[str]:
+    """Yield the upload as decoded text, one chunk at a time."""
+    decoder = None
+    encoding = None
+    total = 0
+
+    while True:
+        chunk = await file.read(chunk_size)
+        if not chunk:
+            break
+
+        total += len(chunk)
+        if total > max_bytes:
+            raise CsvImportTooLarge(f"File is larger than {max_bytes} bytes")
+
+        if decoder is None:
+            encoding, bom_length = detect_encoding(chunk)
+            decoder = codecs.getincrementaldecoder(encoding)()
+            chunk = chunk[bom_length:]
+
+        try:
+            text = decoder.decode(chunk)
+        except UnicodeDecodeError:
+            raise CsvImportError(f"File is not valid {encoding} near byte {total}")
+        yield text
+
+    if decoder is not None:
+        try:
+            yield decoder.decode(b"", final=True)
+        except UnicodeDecodeError:
+            raise CsvImportError("File ends in the middle of a character")
+
+
+async def iter_records(text_chunks: AsyncIterator[str]) -> AsyncIterator[list[str]]:
+    """
+    Yield parsed CSV records from a stream of text chunks.
+
+    csv.reader can't be resumed in the middle of a record, so it is only fed
+    complete records: lines are joined until their quotes balance, which is
+    when a newline really ends the record rather than sitting in a quoted field.
+    """
+    pending = deque()
+    reader = csv.reader(_Drain(pending))
+    buffer = ""
+    record = ""
+
+    async for text in text_chunks:
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+
+        for line in lines:
+            record += line + "\n"
+            if record.count('"') % 2 == 0:
+                pending.append(record)
+                record = ""
+        for row in reader:
+            yield row
+
+    record += buffer
+    if record.strip():
+        pending.append(record)
+        for row in reader:
+            yield row
+
+
+class _Drain:
+    """Iterator over a deque that stops (without finishing) when it is empty."""
+
+    def __init__(self, pending: deque):
+        self.pending = pending
+
+    def __iter__(self):
+        return self
+
+    def __next__(self) -> str:
+        if not self.pending:
+            raise StopIteration
+        return self.pending.popleft()
+
+
+async def iter_csv_rows(
+        file: UploadFile,
+        required: tuple[str, ...],
+        max_rows: int,
+        max_bytes: int,
+        chunk_size: int
+) -> AsyncIterator[tuple[int, dict]]:
+    """
+    Yield (row_number, row) for each non-blank data row of a CSV upload.
+
+    Header names are stripped and lower-cased; row numbers start at 1 for
+    the first row after the header. Raises CsvImportTooLarge when a limit is
+    exceeded and CsvImportError when the file can't be read or the header
+    lacks a required column.
+    """
+    header = None
+    row_number = 0
+
+    async for record in iter_records(iter_text(file, chunk_size, max_bytes)):
+        if header is None:
+            header = [name.strip().lower() for name in record]
+            missing = [name for name in required if name not in header]
+            if missing:
+                names = [f"'{name}'" for name in required]
+                columns = ", ".join(names[:-1]) + " and " + names[-1] if len(names) > 1 else names[0]
+                raise CsvImportError(f"CSV header must include {columns} columns")
+            continue
+
+        if not any(field.strip() for field in record):
+            continue
+
+        row_number += 1
+        if row_number > max_rows:
+            raise CsvImportTooLarge(f"File has more than {max_rows} rows")
+
+        yield row_number, dict(zip(header, record))
+
+    if header is None:
+        raise CsvImportError("File is empty")
@@ -0,0 +1,86 @@
+"""
+Sparse fieldsets for list endpoints.
+
+?fields=exam.id,exam.title,completed trims each item of a response down to
+the named fields; dotted names reach into nested objects. Without fields=
+the endpoint's full response model is returned. For paginated endpoints the
+names refer to the fields of each item.
+"""
+from typing import Optional, get_args, get_origin
+
+from fastapi import HTTPException, Query, status
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, TypeAdapter
+
+from ..schemas.responses import Page
+
+
+def field_selector(
+    fields: Optional[str] = Query(None, description="Comma-separated fields to return, e.g. exam.id,exam.title"),
+) -> Optional[list[str]]:
+    if not fields:
+        return None
+    return [name.strip() for name in fields.split(",") if name.strip()]
+
+
+def _model_of(annotation) -> Optional[type[BaseModel]]:
+    """The pydantic model inside an annotation such as Optional[List[Model]], if any."""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return annotation
+    for arg in get_args(annotation):
+        model = _model_of(arg)
+        if model:
+            return model
+    return None
+
+
+def _is_list(annotation) -> bool:
+    return get_origin(annotation) is list or any(_is_list(arg) for arg in get_args(annotation))
+
+
+def build_include(model: type[BaseModel], fields: list[str]) -> dict:
+    """Turn dotted field names into a pydantic include dict, rejecting unknown names."""
+    include = {}
+    for path in fields:
+        node, current = include, model
+        parts = path.split(".")
+        for i, part in enumerate(parts):
+            if current is None or part not in current.model_fields:
+                raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown field: {path}")
+
+            if i == len(parts) - 1:
+                node[part] = True
+                break
+
+            child = node.setdefault(part, {})
+            if child is True:
+                break  # The whole object was already requested
+
+            annotation = current.model_fields[part].annotation
+            if _is_list(annotation):
+                # Include dicts address list elements by index, or all of them with __all__
+                child = child.setdefault("__all__", {})
+            node, current = child, _model_of(annotation)
+    return include
+
+
+def sparse_response(response_model, data, fields: Optional[list[str]]):
+    """
+    Return `data` as-is when no fields were requested, otherwise a JSONResponse
+    with only those fields of each item. `response_model` is the endpoint's
+    response model: a model, List[model] or Page[model].
+    """
+    if not fields:
+        return data
+
+    if isinstance(response_model, type) and issubclass(response_model, Page):
+        item_model = _model_of(response_model.model_fields["items"].annotation)
+        include = {"items": {"__all__": build_include(item_model, fields)}, "next_cursor": True, "limit": True}
+    elif getattr(response_model, "__origin__", None) is list:
+        include = {"__all__": build_include(_model_of(response_model), fields)}
+    else:
+        include = build_include(response_model, fields)
+
+    adapter = TypeAdapter(response_model)
+    value = adapter.validate_python(data, from_attributes=True)
+    return JSONResponse(adapter.dump_python(value, mode="json", include=include))
@@ -0,0 +1,213 @@
+"""
+In-process metrics exposed in Prometheus text format at /metrics.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+# Latency buckets in seconds, from a fast DB write up to a slow provider call
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: tuple, values: tuple, extra: Optional[dict] = None) -> str:
+    pairs = list(zip(labelnames, values)) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return repr(float(value))
+
+
+class Counter:
+    type_name = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._values: dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        return self._values.get(key, 0)
+
+    def render(self) -> list[str]:
+        with self._lock:
+            return [
+                f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in self._values.items()
+            ]
+
+
+class Gauge(Counter):
+    type_name = "gauge"
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram:
+    type_name = "histogram"
+
+    def __init__(
+            self,
+            name: str,
+            description: str,
+            labelnames: tuple = (),
+            buckets: tuple = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: dict[tuple, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(labels.get(name, "") for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(
+                key, {"buckets": [0] * len(self.buckets), "sum": 0.0, "count": 0}
+            )
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series["buckets"][i] += 1
+            series["sum"] += value
+            series["count"] += 1
+
+    def render(self) -> list[str]:
+        lines = []
+        with self._lock:
+            for key, series in self._series.items():
+                for bound, count in zip(self.buckets, series["buckets"]):
+                    labels = _format_labels(self.labelnames, key, {"le": _format_value(bound)})
+                    lines.append(f"{self.name}_bucket{labels} {count}")
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f"{self.name}_sum{labels} {_format_value(series['sum'])}")
+                lines.append(f"{self.name}_count{labels} {series['count']}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, Counter | Gauge | Histogram] = {}
+
+    def _register(self, metric):
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, description: str, labelnames: tuple = ()) -> Counter:
+        return self._register(Counter(name, description, labelnames))
+
+    def gauge(self, name: str, description: str, labelnames: tuple = ()) -> Gauge:
+        return self._register(Gauge(name, description, labelnames))
+
+    def histogram(
+            self,
+            name: str,
+            description: str,
+            labelnames: tuple = (),
+            buckets: tuple = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, description, labelnames, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.description}")
+            lines.append(f"# TYPE {metric.name} {metric.type_name}")
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+STAGE_LATENCY = metrics.histogram(
+    "gato_stage_latency_seconds",
+    "Latency of each conversation pipeline stage",
+    ("stage", "provider", "model", "language"),
+)
+ACTIVE_SESSIONS = metrics.gauge(
+    "gato_active_sessions",
+    "Conversation WebSocket connections currently open",
+)
+INFLIGHT_TURNS = metrics.gauge(
+    "gato_inflight_turns",
+    "Student turns currently being processed",
+)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class SessionLatencyTracker:
+    """
+    Records stage latencies for one conversation.
+
+    Every measurement is observed into the process-wide STAGE_LATENCY histogram
+    and kept locally so a per-session summary can be stored when it ends.
+    """
+
+    def __init__(self, language: str = ""):
+        self.language = language
+        self._samples: dict[str, list[float]] = {}
+
+    @contextmanager
+    def measure(self, stage: str, service=None):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, service)
+
+    def record(self, stage: str, seconds: float, service=None):
+        STAGE_LATENCY.observe(
+            seconds,
+            stage=stage,
+            provider=getattr(service, "provider", "internal"),
+            model=getattr(service, "model", ""),
+            language=self.language,
+        )
+        self._samples.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> dict:
+        summary = {}
+        for stage, samples in self._samples.items():
+            ordered = sorted(samples)
+            summary[stage] = {
+                "count": len(ordered),
+                "mean": round(sum(ordered) / len(ordered), 4),
+                "p50": round(percentile(ordered, 50), 4),
+                "p95": round(percentile(ordered, 95), 4),
+                "max": round(ordered[-1], 4),
+            }
+        return summary
@@ -0,0 +1,84 @@
+"""
+Keyset pagination for list endpoints.
+
+Pages are ordered newest first by (created_at, id). The cursor encodes the
+last row of a page, and the next page selects rows strictly after it, so
+each page is an index range scan no matter how deep the client has paged,
+and rows inserted meanwhile never shift or repeat entries.
+"""
+import base64
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import and_, or_
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from ..config import settings
+
+
+@dataclass
+class PageParams:
+    limit: int
+    cursor: Optional[str]
+    created_after: Optional[datetime]
+    created_before: Optional[datetime]
+
+
+def page_params(
+    limit: int = Query(settings.page_size_default, ge=1, le=settings.page_size_max),
+    cursor: Optional[str] = None,
+    created_after: Optional[datetime] = None,
+    created_before: Optional[datetime] = None,
+) -> PageParams:
+    """Dependency for the paging and date range query parameters shared by list endpoints."""
+    return PageParams(limit, cursor, created_after, created_before)
+
+
+def encode_cursor(created_at: datetime, id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, id = json.loads(raw)
+        return datetime.fromisoformat(created_at), UUID(id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+async def paginate(db: AsyncSession, statement, model, params: PageParams) -> dict:
+    """
+    Run a select of `model` one page at a time.
+
+    `statement` carries the endpoint's own filters and loader options; this
+    adds the date range, the keyset condition, the ordering and the limit.
+    Returns the fields of a Page response.
+    """
+    if params.created_after:
+        statement = statement.where(model.created_at >= params.created_after)
+    if params.created_before:
+        statement = statement.where(model.created_at < params.created_before)
+
+    if params.cursor:
+        created_at, id = decode_cursor(params.cursor)
+        statement = statement.where(or_(
+            model.created_at < created_at,
+            and_(model.created_at == created_at, model.id < id),
+        ))
+
+    # One extra row tells us whether there is a next page
+    statement = statement.order_by(model.created_at.desc(), model.id.desc()).limit(params.limit + 1)
+    rows = (await db.exec(statement)).all()
+
+    items = rows[:params.limit]
+    next_cursor = None
+    if len(rows) > params.limit:
+        next_cursor = encode_cursor(items[-1].created_at, items[-1].id)
+
+    return {"items": items, "next_cursor": next_cursor, "limit": params.limit}
@@ -1,10 +1,16 @@
+from typing import Optional
+
 import bcrypt
 
+from ..config import settings
+
 
-def hash_password(plain_password: str) -> str:
-    """Hash a plain text password."""
+def hash_password(plain_password: str, rounds: Optional[int] = None) -> str:
+    """Hash a plain text password with the given bcrypt cost (settings.password_hash_rounds by default)."""
     password_bytes = plain_password.encode('utf-8')
-    salt = bcrypt.gensalt(rounds=12)
+    if rounds is None:
+        rounds = settings.password_hash_rounds
+    salt = bcrypt.gensalt(rounds=rounds)
     hashed = bcrypt.hashpw(password_bytes, salt)
     return hashed.decode('utf-8')
 
@@ -14,3 +20,18 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     password_bytes = plain_password.encode('utf-8')
     hashed_bytes = hashed_password.encode('utf-8')
     return bcrypt.checkpw(password_bytes, hashed_bytes)
+
+
+def hash_rounds(hashed_password: str) -> Optional[int]:
+    """The cost a bcrypt hash was made with ("$2b$12$..." -> 12), or None if it isn't one."""
+    parts = hashed_password.split("$")
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+def needs_rehash(hashed_password: str, rounds: Optional[int] = None) -> bool:
+    """Whether the hash was made with a different cost than the configured one."""
+    if rounds is None:
+        rounds = settings.password_hash_rounds
+    return hash_rounds(hashed_password) != rounds
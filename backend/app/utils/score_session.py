@@ -1,50 +1,53 @@
-from sqlmodel import Session, select
+from sqlalchemy.orm import selectinload
+from sqlmodel import select
 from datetime import datetime, timezone
 from uuid import UUID
 import re
 
-from ..config import settings
-from ..database.database import engine
-from ..services.scoring_engine import ScoringEngine
+from ..database.database import async_session
+from ..services.providers import get_scoring_engine
 from ..controllers.exam import parse_vocabulary
 from ..models.conversation_session import ConversationSession
 from ..models.conversation_turn import ConversationTurn
 from ..models.session_score import SessionScore
 from ..models.exam import Exam
+from ..models.vocabulary import VocabularyList
 
-scoring_engine = ScoringEngine(settings.anthropic_api_key)
+async def generate_session_score(conversation_session_id: str):
+    turns, target_language, expected_tenses, expected_vocab = await load_scoring_inputs(conversation_session_id)
 
-def generate_session_score(conversation_session_id: str):
-    with Session(engine) as db:
-        conversation_session = db.get(ConversationSession, UUID(conversation_session_id))
-        exam = db.get(Exam, conversation_session.exam_id)
+    try:
+        scores_dict = await get_scoring_engine().analyze_with_ai(conversation_turns=turns, target_language=target_language, expected_tenses=expected_tenses, vocabulary=expected_vocab)
+    except ValueError as e:
+        print(f"An error has occurred generating the score: {e}")
+        return None
 
-        statement = select(ConversationTurn).where(ConversationTurn.session_id == conversation_session.id)
-        turns = db.exec(statement).all()
+    # Get overall score
+    overall_score = (scores_dict["grammar_accuracy_score"] + scores_dict["verb_tense_accuracy_score"] + scores_dict["fluency_score"] + scores_dict["vocabulary_usage_score"]) / 4
+    scores_dict["overall_score"] = overall_score
 
-        student_turns = [t for t in turns if t.speaker == "student"]
-        student_text = " ".join([t.transcript for t in student_turns])
-        
-        # Remove punctuation from student text before splitting
+    await create_session_score(scores_dict=scores_dict, conversation_session_id=conversation_session_id)
+    return scores_dict
 
-        expected_vocab = parse_vocabulary(vocabulary_list=exam.vocabulary_list)
+async def load_scoring_inputs(conversation_session_id: str) -> tuple[list, str, str, list[str]]:
+    async with async_session() as db:
+        conversation_session = await db.get(ConversationSession, UUID(conversation_session_id))
+        exam = await db.get(
+            Exam,
+            conversation_session.exam_id,
+            options=[selectinload(Exam.vocabulary_list).selectinload(VocabularyList.items)]
+        )
 
-        try:
-            scores_dict = scoring_engine.analyze_with_ai(conversation_turns=turns, target_language=exam.target_language, expected_tenses=exam.tenses, vocabulary=expected_vocab)
-        except ValueError as e:
-            print(f"An error has occurred generating the score: {e}")
-            return None
+        statement = select(ConversationTurn).where(ConversationTurn.session_id == conversation_session.id)
+        turns = (await db.exec(statement)).all()
 
-        # Get overall score
-        overall_score = (scores_dict["grammar_accuracy_score"] + scores_dict["verb_tense_accuracy_score"] + scores_dict["fluency_score"] + scores_dict["vocabulary_usage_score"]) / 4
-        scores_dict["overall_score"] = overall_score
+        expected_vocab = parse_vocabulary(vocabulary_list=exam.vocabulary_list)
 
-        create_session_score(scores_dict=scores_dict, conversation_session_id=conversation_session_id)
-    return scores_dict
+        return turns, exam.target_language, exam.tenses, expected_vocab
 
-def create_session_score(scores_dict: dict, conversation_session_id: str) -> None:
-    with Session(engine) as db:
-        conversation_session = db.get(ConversationSession, UUID(conversation_session_id))
+async def create_session_score(scores_dict: dict, conversation_session_id: str) -> None:
+    async with async_session() as db:
+        conversation_session = await db.get(ConversationSession, UUID(conversation_session_id))
         new_score = SessionScore(
             session_id=conversation_session.id,
             grammar_accuracy_score=scores_dict["grammar_accuracy_score"],
@@ -58,6 +61,5 @@ def create_session_score(scores_dict: dict, conversation_session_id: str) -> Non
         )
         
         db.add(new_score)
-        db.commit()
-        db.refresh(new_score)
+        await db.commit()
 
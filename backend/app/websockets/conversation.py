@@ -1,51 +1,49 @@
 from fastapi import WebSocket, WebSocketDisconnect
-from sqlmodel import Session, select
+from sqlmodel import select
 from datetime import datetime, timezone
 import time
 from uuid import UUID
 import json
 import base64
+import asyncio
+from typing import Optional
 
-from ..services.conversation_engine import ConversationEngine
-from ..services.speech_to_text import SpeechToTextService
-from ..services.text_to_speech import TextToSpeechService
+from ..services.sentence_splitter import split_sentences
 from ..config import settings
-from ..database.database import engine
+from ..database.database import async_session
 from ..models.conversation_session import ConversationSession, SessionStatus
 from ..models.conversation_turn import ConversationTurn
-from ..utils.score_session import generate_session_score
+from ..models.exam import Exam
+from ..schemas.responses import SessionScoreResponse
+from ..services.scoring_queue import scoring_queue
+from ..services.turn_writer import TurnWriter
+from ..services.providers import get_conversation_engine, get_speech_to_text_service, get_text_to_speech_service
+from ..services.openings import get_exam_opening
+from ..services.conversation_memory import ConversationMemory
+from ..utils.metrics import ACTIVE_SESSIONS, INFLIGHT_TURNS, SessionLatencyTracker
+from ..models.session_metrics import SessionMetrics
 
 
-if settings.use_mock_services:
-    from ..services.mock_services import (
-        MockConversationEngine as ConversationEngine,
-        MockSpeechToTextService as SpeechToTextService,
-        MockTextToSpeechService as TextToSpeechService,
-    )
-else:
-    from ..services.conversation_engine import ConversationEngine
-    from ..services.speech_to_text import SpeechToTextService
-    from ..services.text_to_speech import TextToSpeechService
-
 class ConversationHandler:
     def __init__(self):
-        if settings.use_mock_services:
-            self.conversation_engine = ConversationEngine()
-            self.stt_service = SpeechToTextService()
-            self.tts_service = TextToSpeechService()
-        else:
-            self.conversation_engine = ConversationEngine(settings.anthropic_api_key)
-            self.stt_service = SpeechToTextService(settings.openai_api_key)
-            self.tts_service = TextToSpeechService(settings.openai_api_key)
+        self.conversation_engine = get_conversation_engine()
+        self.stt_service = get_speech_to_text_service()
+        self.tts_service = get_text_to_speech_service()
     
     async def handle_connection(self, websocket: WebSocket):
         await websocket.accept()
         
-        conversation_history = []
+        memory = ConversationMemory(self.conversation_engine)
+        token_usage = []
         system_prompt = None
         target_language = "spanish"
         session_id = None
         turn_number = 0
+        streaming = False
+        binary_audio = False
+        turn_writer = TurnWriter()
+        latency = SessionLatencyTracker(target_language)
+        ACTIVE_SESSIONS.inc()
         
 
         try:
@@ -54,25 +52,37 @@ class ConversationHandler:
                 
                 if data["type"] == "config":
                     target_language = data.get("targetLanguage", "spanish")
+                    latency.language = target_language
                     exam_data = data.get("exam")
                     session_id = data.get("id")
                     system_prompt = exam_data.get("conversation_prompt")
+                    streaming = bool(data.get("stream", False))
+                    binary_audio = bool(data.get("binary_audio", False))
+
+                    if binary_audio:
+                        # Confirm the client may receive tutor audio as raw binary frames
+                        await websocket.send_json({
+                            "type": "protocol",
+                            "binary_audio": True
+                        })
 
                     if session_id:
-                        with Session(engine) as db:
-                            session = db.get(ConversationSession, UUID(session_id))
+                        async with async_session() as db:
+                            session = await db.get(ConversationSession, UUID(session_id))
+
+                            if session:
+                                # The exam's stored prompt drives the conversation, never the client's copy
+                                statement = select(Exam.conversation_prompt).where(Exam.id == session.exam_id)
+                                system_prompt = (await db.exec(statement)).first() or system_prompt
                             
                             if session and session.status == SessionStatus.in_progress:
                                 print(">>> Resuming existing session")
                                 statement = select(ConversationTurn).where(ConversationTurn.session_id == session.id).order_by(ConversationTurn.turn_number)
-                                existing_turns = db.exec(statement).all()
+                                existing_turns = (await db.exec(statement)).all()
 
                                 for turn in existing_turns:
                                     role = "user" if turn.speaker == "student" else "assistant"
-                                    conversation_history.append({
-                                        "role": role,
-                                        "content": turn.transcript
-                                    })
+                                    memory.append(role, turn.transcript)
 
                                 turn_number = len(existing_turns)
 
@@ -94,15 +104,16 @@ class ConversationHandler:
                                 session.status = SessionStatus.in_progress
                                 session.started_at = datetime.now(timezone.utc)
                                 db.add(session)
-                                db.commit()
+                                await db.commit()
 
-                                # Generate opening
-                                opening = await self.conversation_engine.generate_opening(system_prompt)
-                                opening_audio = await self.tts_service.synthesize(opening)
+                                # Served from the exam's pre-generated opening when it matches the exam's prompt
+                                with latency.measure("opening"):
+                                    opening, opening_audio = await get_exam_opening(session.exam_id, system_prompt)
                     
                                 if session_id:
                                     turn_number += 1
                                     self._save_turn(
+                                        turn_writer,
                                         session_id=session_id,
                                         turn_number=turn_number,
                                         speaker="tutor",
@@ -110,13 +121,12 @@ class ConversationHandler:
                                         target_language=target_language
                                     )
 
-                                await websocket.send_json({
+                                await self._send_audio_message(websocket, {
                                     "type": "tutor_message",
                                     "text": opening,
-                                    "audio": base64.b64encode(opening_audio).decode()
-                                })
+                                }, opening_audio, binary_audio)
                                 
-                                conversation_history.append({"role": "assistant", "content": opening})
+                                memory.append("assistant", opening)
                 
                 elif data["type"] == "audio":
                     if not system_prompt:
@@ -126,109 +136,133 @@ class ConversationHandler:
                         })
                         continue
                     
-                    receive_time = time.perf_counter()
-                    print("Audio received at ", receive_time)
-                    
-                    # Decode
-                    decode_start = time.perf_counter()
-                    print("Decoding audio...") 
-                    audio_bytes = base64.b64decode(data["audio"])
-                    decode_end = time.perf_counter()
-                    print(f"Audio decoding completed. Time elapsed: {(decode_end - decode_start):.2f}seconds")
-                    
-                    # Transcribe
-                    ##### Bottleneck step
-                    transcribe_start = time.perf_counter()
-                    transcript = await self.stt_service.transcribe(audio_bytes, target_language)
-                    transcribe_end = time.perf_counter()
-                    print(f"Audio transcription completed. Time elapsed: {(transcribe_end - transcribe_start):.2f}seconds")
-                    
-                    save_turn_start = time.perf_counter()
-                    print("Saving turn...")
-                    if session_id:
-                        turn_number += 1
-                        self._save_turn(
-                            session_id=session_id,
-                            turn_number=turn_number,
-                            speaker="student",
-                            transcript=transcript,
-                            target_language=target_language
-                        )
-
-                    save_turn_end = time.perf_counter()
-                    print(f"Save turn completed. Time elapsed: {(save_turn_end - save_turn_start):.2f}seconds")
-                    
-                    transcript_send_start = time.perf_counter()
-                    print("Sending transcript back...")
-                    # Send transcript back
-                    await websocket.send_json({
-                        "type": "transcript",
-                        "text": transcript
-                    })
-                    transcript_send_end = time.perf_counter()
-                    print(f"Send transcript back. Time elapsed: {(transcript_send_end - transcript_send_start):.2f}seconds")
-                    
-                    # Generate response
-                    ##### Bottleneck step
-                    response_gen_start = time.perf_counter()
-                    print("Generating response...")
-                    response = await self.conversation_engine.generate_response(
-                        system_prompt,
-                        conversation_history,
-                        transcript
-                    )
-                    response_gen_stop = time.perf_counter()
-                    print(f"response generation took {(response_gen_stop - response_gen_start):.2f}seconds")
+                    INFLIGHT_TURNS.inc()
+                    turn_start = time.perf_counter()
+                    try:
+                        # Decode
+                        with latency.measure("decode"):
+                            if data.get("binary"):
+                                # Audio follows this control frame as a raw binary frame
+                                audio_bytes = await websocket.receive_bytes()
+                            else:
+                                audio_bytes = base64.b64decode(data["audio"])
 
-                    if session_id:
-                        turn_number += 1
-                        self._save_turn(
-                            session_id=session_id,
-                            turn_number=turn_number,
-                            speaker="tutor",
-                            transcript=response,
-                            target_language=target_language
-                        )
-                    
-                    # Convert to speech 
-                    ##### PRIMARY BOTTLENECK
-                    print("Converting audio...")
-                    convert_start = time.perf_counter()
-                    response_audio = await self.tts_service.synthesize(response)
-                    convert_end = time.perf_counter()
-                    print(f"Audio conversion completed. Time elapsed: {(convert_end - convert_start):.2f}seconds")
-
-                    send_response_start = time.perf_counter()
-                    print("sending response")
-                    # Send response
-                    await websocket.send_json({
-                        "type": "tutor_message",
-                        "text": response,
-                        "audio": base64.b64encode(response_audio).decode()
-                    })
-                    send_response_end = time.perf_counter()
-                    print(f"response sent at {send_response_end}. Time elapsed: {(send_response_end - send_response_start):.2f}seconds")
+                        # Transcribe
+                        ##### Bottleneck step
+                        with latency.measure("transcribe", self.stt_service):
+                            transcript = await self.stt_service.transcribe(audio_bytes, target_language)
+
+                        with latency.measure("save_turn"):
+                            if session_id:
+                                turn_number += 1
+                                self._save_turn(
+                                    turn_writer,
+                                    session_id=session_id,
+                                    turn_number=turn_number,
+                                    speaker="student",
+                                    transcript=transcript,
+                                    target_language=target_language
+                                )
+
+                        # Send transcript back
+                        with latency.measure("send_transcript"):
+                            await websocket.send_json({
+                                "type": "transcript",
+                                "text": transcript
+                            })
+
+                        # Generate response
+                        ##### Bottleneck step
+                        history, history_summary = memory.context()
+                        usage = {}
+                        if streaming:
+                            # Audio goes out sentence by sentence while the model is still generating
+                            with latency.measure("stream_reply", self.conversation_engine):
+                                response = await self._stream_tutor_reply(
+                                    websocket,
+                                    system_prompt,
+                                    history,
+                                    transcript,
+                                    latency,
+                                    binary_audio,
+                                    history_summary=history_summary,
+                                    usage=usage,
+                                    target_language=target_language
+                                )
+                        else:
+                            with latency.measure("generate", self.conversation_engine):
+                                response = await self.conversation_engine.generate_response(
+                                    system_prompt,
+                                    history,
+                                    transcript,
+                                    history_summary=history_summary,
+                                    usage=usage
+                                )
+                        token_usage.append({"turn": turn_number + 1, "context_messages": len(history), **usage})
+
+                        if session_id:
+                            turn_number += 1
+                            self._save_turn(
+                                turn_writer,
+                                session_id=session_id,
+                                turn_number=turn_number,
+                                speaker="tutor",
+                                transcript=response,
+                                target_language=target_language
+                            )
+
+                        if not streaming:
+                            # Convert to speech 
+                            ##### PRIMARY BOTTLENECK
+                            with latency.measure("tts", self.tts_service):
+                                response_audio = await self.tts_service.synthesize(response)
+
+                            # Send response
+                            with latency.measure("send_response"):
+                                await self._send_audio_message(websocket, {
+                                    "type": "tutor_message",
+                                    "text": response,
+                                }, response_audio, binary_audio)
+                    finally:
+                        INFLIGHT_TURNS.dec()
+                    latency.record("turn", time.perf_counter() - turn_start)
                     
                     # Update history
-                    conversation_history.append({"role": "user", "content": transcript})
-                    conversation_history.append({"role": "assistant", "content": response})
+                    memory.append("user", transcript)
+                    memory.append("assistant", response)
                 
                 elif data["type"] == "end_session":
+                    # Scoring reads the turns back, so they must be written first
+                    await turn_writer.flush()
+
                     if session_id:
-                        with Session(engine) as db:
-                            session = db.get(ConversationSession, UUID(session_id))
+                        async with async_session() as db:
+                            session = await db.get(ConversationSession, UUID(session_id))
                             if session:
                                 session.status = SessionStatus.completed
                                 session.ended_at = datetime.now(timezone.utc)
                                 db.add(session)
-                                db.commit()
+                                await db.commit()
+
+                        await self._save_session_metrics(session_id, latency, token_usage)
+
+                    job = await scoring_queue.enqueue(UUID(session_id)) if session_id else None
 
                     await websocket.send_json({
                         "type": "session_ended",
-                        "turns": turn_number
+                        "turns": turn_number,
+                        "scoring": job.status if job else None
                     })
                     print(f"Session {session_id} ended with {turn_number} turns")
-                    generate_session_score(conversation_session_id=session_id)
+
+                    # Push the score if it is ready while the client is still listening
+                    if job:
+                        score = await scoring_queue.wait_for(job.session_id, settings.scoring_push_timeout_seconds)
+                        if score:
+                            await websocket.send_json({
+                                "type": "session_score",
+                                "score": SessionScoreResponse.model_validate(score).model_dump(mode="json")
+                            })
                     break
         
         except WebSocketDisconnect:
@@ -239,9 +273,125 @@ class ConversationHandler:
                 "type": "error", 
                 "message": str(e)
             })
+        finally:
+            ACTIVE_SESSIONS.dec()
+            memory.close()
+            try:
+                await turn_writer.close()
+            except Exception as e:
+                print(f"Failed to write remaining turns for session {session_id}: {e}")
+
+    async def _stream_tutor_reply(
+            self,
+            websocket: WebSocket,
+            system_prompt: str,
+            conversation_history: list[dict],
+            student_message: str,
+            latency: SessionLatencyTracker,
+            binary_audio: bool = False,
+            history_summary: Optional[str] = None,
+            usage: Optional[dict] = None,
+            target_language: Optional[str] = None
+    ) -> str:
+        """
+        Pipe the LLM stream through TTS one sentence at a time.
+
+        Each sentence is sent to TTS as soon as it is complete, while the model
+        keeps generating the next one. Audio chunks are still sent in order,
+        followed by a single tutor_message_done frame with the full text.
+        """
+        pending: asyncio.Queue = asyncio.Queue()
+        stream_start = time.perf_counter()
+
+        async def synthesize(sentence: str) -> bytes:
+            with latency.measure("tts", self.tts_service):
+                return await self.tts_service.synthesize(sentence)
+
+        async def produce():
+            try:
+                text_stream = self.conversation_engine.stream_response(
+                    system_prompt,
+                    conversation_history,
+                    student_message,
+                    history_summary=history_summary,
+                    usage=usage
+                )
+                async for sentence in split_sentences(text_stream, language=target_language):
+                    synthesis = asyncio.create_task(synthesize(sentence))
+                    await pending.put((sentence, synthesis))
+            finally:
+                await pending.put(None)
+
+        producer = asyncio.create_task(produce())
+        sentences = []
+
+        try:
+            while True:
+                item = await pending.get()
+                if item is None:
+                    break
+
+                sentence, synthesis = item
+                audio = await synthesis
+                if not sentences:
+                    latency.record("first_audio", time.perf_counter() - stream_start)
+                await self._send_audio_message(websocket, {
+                    "type": "tutor_audio_chunk",
+                    "index": len(sentences),
+                    "text": sentence,
+                }, audio, binary_audio)
+                sentences.append(sentence)
+
+            # Surface any error raised while reading the LLM stream
+            await producer
+        finally:
+            producer.cancel()
+            while not pending.empty():
+                item = pending.get_nowait()
+                if item is not None:
+                    item[1].cancel()
+
+        response = " ".join(sentences)
+        await websocket.send_json({
+            "type": "tutor_message_done",
+            "text": response,
+            "chunks": len(sentences)
+        })
+
+        return response
+
+    async def _send_audio_message(
+            self,
+            websocket: WebSocket,
+            message: dict,
+            audio: bytes,
+            binary_audio: bool
+    ):
+        """
+        Send a message that carries tutor audio.
+
+        Clients that negotiated binary_audio get the JSON frame with the audio
+        length, immediately followed by the raw bytes in a binary frame. Older
+        clients get the audio base64-encoded inside the JSON frame.
+        """
+        if binary_audio:
+            await websocket.send_json({**message, "audio_bytes": len(audio)})
+            await websocket.send_bytes(audio)
+        else:
+            await websocket.send_json({**message, "audio": base64.b64encode(audio).decode()})
+
+    async def _save_session_metrics(self, session_id: str, latency: SessionLatencyTracker, token_usage: list[dict]):
+        async with async_session() as db:
+            statement = select(SessionMetrics).where(SessionMetrics.session_id == UUID(session_id))
+            session_metrics = (await db.exec(statement)).first() or SessionMetrics(session_id=UUID(session_id), latency_summary="{}")
+            session_metrics.latency_summary = json.dumps(latency.summary())
+            session_metrics.token_usage = json.dumps(token_usage)
+            db.add(session_metrics)
+            await db.commit()
 
     def _save_turn(
             self,
+            turn_writer: TurnWriter,
             session_id: str,
             turn_number: int,
             speaker: str,
@@ -249,14 +399,12 @@ class ConversationHandler:
             target_language: str,
             audio_url: str = None
     ):
-        with Session(engine) as db:
-            turn = ConversationTurn(
-                session_id=UUID(session_id),
-                turn_number = turn_number,
-                speaker=speaker,
-                transcript=transcript,
-                target_language=target_language,
-                audio_url=audio_url
-            )
-            db.add(turn)
-            db.commit()
\ No newline at end of file
+        # Buffered; the writer inserts it off the turn pipeline
+        turn_writer.add(ConversationTurn(
+            session_id=UUID(session_id),
+            turn_number = turn_number,
+            speaker=speaker,
+            transcript=transcript,
+            target_language=target_language,
+            audio_url=audio_url
+        ))
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Checks that simultaneous conversation turns overlap instead of queueing.
+
+Starts the app in-process on mock services where speech-to-text, the LLM
+and text-to-speech each take a fixed --delay, so one turn takes 3 × --delay.
+Connects --students sessions, waits for every opening, then has all of them
+send one recording at the same moment. Fails (exit code 1) if the last reply
+arrives later than --tolerance × one turn's latency, i.e. if the provider
+calls are being serialized somewhere.
+
+Usage (from backend/):
+    python -m benchmarks.concurrency_check --students 50 --delay 0.2
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import sys
+import time
+
+from .ws_load import create_sessions, receive_json
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=50, help="concurrent sessions")
+    parser.add_argument("--delay", type=float, default=0.2, help="fixed mock latency of each provider call, in seconds")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="allowed wall time, in turns")
+    parser.add_argument("--database-url", default="sqlite:///./concurrency_check.db", help="SQLAlchemy URL for the run")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["USE_MOCK_SERVICES"] = "true"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["MOCK_STT_LATENCY"] = f"fixed:{args.delay}"
+    os.environ["MOCK_LLM_LATENCY"] = f"fixed:{args.delay}"
+    os.environ["MOCK_TTS_LATENCY"] = f"fixed:{args.delay}"
+    os.environ["MOCK_SCORING_LATENCY"] = ""
+    os.environ["TTS_CACHE_DIR"] = ""
+
+    if args.database_url.startswith("sqlite:///"):
+        path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+
+
+async def run_student(url: str, session_id: str, exam: dict, ready: asyncio.Barrier) -> float:
+    """Open a session, wait for everyone, then time one turn; returns when the reply arrived."""
+    import websockets
+
+    audio = base64.b64encode(os.urandom(16_000)).decode()
+    async with websockets.connect(url, max_size=None) as ws:
+        await ws.send(json.dumps({"type": "config", "id": session_id, "exam": exam, "targetLanguage": "spanish"}))
+        while (await receive_json(ws))["type"] != "tutor_message":
+            pass
+
+        await ready.wait()
+        await ws.send(json.dumps({"type": "audio", "audio": audio}))
+        while True:
+            message = await receive_json(ws)
+            if message["type"] == "error":
+                raise RuntimeError(message["message"])
+            if message["type"] == "tutor_message":
+                return time.perf_counter()
+
+
+async def run(args) -> bool:
+    import uvicorn
+    from app.main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    try:
+        exam, session_ids = await asyncio.to_thread(create_sessions, args.students)
+
+        # Everyone sends their recording once all openings are in
+        ready = asyncio.Barrier(args.students + 1)
+        url = f"ws://127.0.0.1:{port}/ws/conversation"
+        students = [asyncio.create_task(run_student(url, session_id, exam, ready)) for session_id in session_ids]
+        await ready.wait()
+        start = time.perf_counter()
+        finished = await asyncio.gather(*students)
+    finally:
+        server.should_exit = True
+        await server_task
+
+    turn_latency = 3 * args.delay
+    wall = max(finished) - start
+    ok = wall <= args.tolerance * turn_latency
+    print(
+        f"{'ok  ' if ok else 'FAIL'} {args.students} simultaneous turns took {wall:.3f}s; "
+        f"one turn is {turn_latency:.3f}s, limit {args.tolerance * turn_latency:.3f}s"
+    )
+    return ok
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+
+    sys.exit(0 if asyncio.run(run(args)) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,174 @@
+"""
+Login storm: a whole class logging in at once.
+
+Starts the app in-process, creates --students users sharing one password,
+then has all of them POST /auth/login together while a probe polls /health
+to show how responsive the server stays. Prints a JSON report with login
+throughput and p50/p95/p99 latencies for the logins and the probe.
+
+Compare --workers 0 (bcrypt in the default thread pool) with the process
+pool, and pass --seed-rounds different from --rounds to include the
+rehash-on-login path.
+
+Usage (from backend/):
+    python -m benchmarks.login_storm --students 40 --rounds 12 --workers 2
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import time
+
+PASSWORD = "storm-password-123"
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=40, help="concurrent logins")
+    parser.add_argument("--rounds", type=int, default=12, help="bcrypt cost configured for the app")
+    parser.add_argument("--seed-rounds", type=int, help="bcrypt cost of the stored hashes (default: --rounds)")
+    parser.add_argument("--workers", type=int, default=2, help="password hashing processes (0 = thread pool)")
+    parser.add_argument("--probe-interval", type=float, default=0.02, help="seconds between /health probes")
+    parser.add_argument("--database-url", default="sqlite:///./login_storm.db", help="SQLAlchemy URL for the run")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["USE_MOCK_SERVICES"] = "true"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["PASSWORD_HASH_ROUNDS"] = str(args.rounds)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["TTS_CACHE_DIR"] = ""
+
+    if args.database_url.startswith("sqlite:///"):
+        path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def create_students(count: int, rounds: int) -> list[str]:
+    """Create `count` students with the same password; returns their emails."""
+    from sqlmodel import Session
+    from app.database.database import engine
+    from app.models import User
+    from app.utils.password import hash_password
+
+    # One hash for everyone; hashing per user would make seeding take longer than the run
+    password_hash = hash_password(PASSWORD, rounds)
+    emails = [f"storm-{i}-{time.time_ns()}@example.com" for i in range(count)]
+
+    with Session(engine) as db:
+        for i, email in enumerate(emails):
+            db.add(User(email=email, password_hash=password_hash, first_name="Storm", last_name=f"Student {i}"))
+        db.commit()
+    return emails
+
+
+async def login(client, email: str, samples: list[float]):
+    start = time.perf_counter()
+    response = await client.post("/auth/login", json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    samples.append(time.perf_counter() - start)
+
+
+async def probe(client, interval: float, samples: list[float], done: asyncio.Event):
+    while not done.is_set():
+        start = time.perf_counter()
+        await client.get("/health")
+        samples.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+
+
+def summarize(values: list[float]) -> dict:
+    from app.utils.metrics import percentile
+
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "count": len(ordered),
+        "p50": round(percentile(ordered, 50), 4),
+        "p95": round(percentile(ordered, 95), 4),
+        "p99": round(percentile(ordered, 99), 4),
+        "max": round(ordered[-1], 4),
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    import uvicorn
+    from app.main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    seed_rounds = args.seed_rounds or args.rounds
+    emails = await asyncio.to_thread(create_students, args.students, seed_rounds)
+
+    limits = httpx.Limits(max_connections=args.students + 1)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=120) as client:
+        # Warm up the worker processes so spawning them isn't counted
+        await client.post("/auth/login", json={"email": emails[0], "password": PASSWORD})
+
+        login_samples: list[float] = []
+        probe_samples: list[float] = []
+        done = asyncio.Event()
+        probe_task = asyncio.create_task(probe(client, args.probe_interval, probe_samples, done))
+
+        start = time.perf_counter()
+        results = await asyncio.gather(
+            *(login(client, email, login_samples) for email in emails),
+            return_exceptions=True,
+        )
+        elapsed = time.perf_counter() - start
+
+        done.set()
+        await probe_task
+
+    server.should_exit = True
+    await server_task
+
+    errors = [repr(result) for result in results if isinstance(result, Exception)]
+
+    return {
+        "config": {
+            "students": args.students,
+            "rounds": args.rounds,
+            "seed_rounds": seed_rounds,
+            "workers": args.workers,
+            "cpus": os.cpu_count(),
+            "database": args.database_url.split(":", 1)[0],
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "logins_completed": len(login_samples),
+        "logins_per_second": round(len(login_samples) / elapsed, 3) if elapsed else 0,
+        "login": summarize(login_samples),
+        "health_probe": summarize(probe_samples),
+        "errors": errors[:10],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
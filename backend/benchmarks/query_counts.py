@@ -0,0 +1,192 @@
+"""
+Checks that list endpoints run a constant number of SQL queries.
+
+Seeds a small and a large data set into a throwaway database, calls each
+endpoint against both through count_queries(), and fails if the count
+grows with the data (an N+1 pattern).
+
+Usage (from backend/):
+    python -m benchmarks.query_counts
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite:///./query_counts.db", help="SQLAlchemy URL for the run")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["USE_MOCK_SERVICES"] = "true"
+    os.environ["DATABASE_URL"] = args.database_url
+
+    if args.database_url.startswith("sqlite:///"):
+        path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def seed(db, exams: int, students: int):
+    """Create a teacher with `exams` exams, each assigned to `students` students."""
+    from app.models import User, Exam, ConversationSession, SessionScore
+    from app.models.vocabulary import VocabularyList
+    from app.models.conversation_session import SessionStatus
+
+    teacher = User(
+        email=f"teacher-{time.time_ns()}@example.com",
+        password_hash="!",
+        first_name="Query",
+        last_name="Teacher",
+        role="teacher",
+    )
+    db.add(teacher)
+    db.flush()
+
+    vocabulary_list = VocabularyList(title="Food", target_language="spanish", teacher_id=teacher.id)
+    db.add(vocabulary_list)
+    db.flush()
+
+    roster = []
+    for i in range(students):
+        student = User(
+            email=f"student-{i}-{time.time_ns()}@example.com",
+            password_hash="!",
+            first_name="Query",
+            last_name=f"Student {i}",
+            teacher_id=teacher.id,
+        )
+        db.add(student)
+        roster.append(student)
+    db.flush()
+
+    statuses = list(SessionStatus)
+    for e in range(exams):
+        exam = Exam(
+            title=f"Exam {e}",
+            target_language="spanish",
+            topic="food",
+            difficulty_level="beginner",
+            conversation_prompt="",
+            created_by_id=teacher.id,
+            vocabulary_list_id=vocabulary_list.id,
+        )
+        db.add(exam)
+        db.flush()
+
+        for i, student in enumerate(roster):
+            session = ConversationSession(exam_id=exam.id, student_id=student.id, status=statuses[i % len(statuses)])
+            db.add(session)
+            if session.status == SessionStatus.completed:
+                db.flush()
+                db.add(SessionScore(
+                    session_id=session.id,
+                    vocabulary_usage_score=80,
+                    grammar_accuracy_score=80,
+                    verb_tense_accuracy_score=80,
+                    fluency_score=80,
+                    overall_score=80,
+                ))
+
+    db.commit()
+    return teacher.id, roster[0].id
+
+
+def checks():
+    """
+    Endpoint calls to compare, as name -> (async fn(db, teacher, student), response_model).
+
+    Results are validated against the response model inside the counted block,
+    so lazy loads triggered during serialization are counted too.
+    """
+    from typing import List
+    from sqlmodel import select
+    from app.controllers import exam
+    from fastapi import BackgroundTasks
+    from app.models import Exam, SessionAssignment
+    from app.schemas.responses import ConversationSessionResponse, DashboardExamResponse, ExamSummaryResponse, Page, StudentAssignmentSummaryResponse
+    from app.utils.pagination import PageParams
+
+    async def assign_exam(db, teacher, student):
+        new_exam = Exam(
+            title="Assign all",
+            target_language="spanish",
+            topic="food",
+            difficulty_level="beginner",
+            conversation_prompt="",
+            created_by_id=teacher.id,
+        )
+        db.add(new_exam)
+        await db.commit()
+
+        assignment = SessionAssignment(exam_id=new_exam.id, assign_all=True)
+        return await exam.assign_exam(assignment, BackgroundTasks(), db=db, current_user=teacher)
+
+    async def get_exam_scores(db, teacher, student):
+        exam_id = (await db.exec(select(Exam.id).where(Exam.created_by_id == teacher.id))).first()
+        return await exam.get_exam_scores(exam_id=exam_id, response_format="json", db=db, current_user=teacher)
+
+    return {
+        "teacher_dashboard": (
+            lambda db, teacher, student: exam.teacher_dashboard(include_sessions=True, fields=None, db=db, current_user=teacher),
+            List[DashboardExamResponse],
+        ),
+        "student_dashboard": (
+            lambda db, teacher, student: exam.student_dashboard(fields=None, db=db, current_user=student),
+            List[StudentAssignmentSummaryResponse],
+        ),
+        "get_my_exams": (
+            lambda db, teacher, student: exam.get_my_exams(page=PageParams(50, None, None, None), fields=None, db=db, current_user=teacher),
+            Page[ExamSummaryResponse],
+        ),
+        "get_exam_scores": (get_exam_scores, dict),
+        "assign_exam": (assign_exam, List[ConversationSessionResponse]),
+    }
+
+
+async def run() -> bool:
+    from pydantic import TypeAdapter
+    from sqlmodel import Session
+    from app.database.database import engine, async_session, init_db
+    from app.database.query_counter import count_queries
+    from app.models import User
+
+    await init_db()
+
+    with Session(engine) as db:
+        small = seed(db, exams=2, students=3)
+        large = seed(db, exams=20, students=150)
+
+    failed = False
+    for name, (call, response_model) in checks().items():
+        adapter = TypeAdapter(response_model)
+        counts = []
+        for teacher_id, student_id in (small, large):
+            async with async_session() as db:
+                teacher = await db.get(User, teacher_id)
+                student = await db.get(User, student_id)
+                with count_queries() as counter:
+                    adapter.validate_python(await call(db, teacher, student), from_attributes=True)
+                counts.append(counter.count)
+
+        ok = counts[0] == counts[1]
+        failed = failed or not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {name}: {counts[0]} queries small, {counts[1]} queries large")
+
+    return not failed
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+
+    sys.exit(0 if asyncio.run(run()) else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+"""
+Cold start time of the API.
+
+Fills a throwaway database with --users users and --vocabulary-items
+vocabulary list items, then starts the app --runs times, each in a fresh
+interpreter so nothing is already imported. Each run times `import app.main`
+and the lifespan startup (table creation, migrations and, with --seed, the
+seed checks) and records whether importing the app pulled in the provider
+SDKs. Prints a JSON report with the median and max of each.
+
+Startup should not grow with --users or --vocabulary-items, and importing
+the app should not import either SDK. With --no-mock the lifespan still
+loads them when it opens the provider connection pools.
+
+Usage (from backend/):
+    python -m benchmarks.startup --users 100000 --vocabulary-items 100000 --runs 5
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=50000, help="users in the database before startup")
+    parser.add_argument("--vocabulary-items", type=int, default=50000, help="vocabulary list items before startup")
+    parser.add_argument("--runs", type=int, default=5, help="cold starts to time")
+    parser.add_argument("--seed", action=argparse.BooleanOptionalAction, default=True, help="run with SEED_ON_STARTUP")
+    parser.add_argument("--mock", action=argparse.BooleanOptionalAction, default=True, help="run with USE_MOCK_SERVICES")
+    parser.add_argument("--database-url", default="sqlite:///./startup.db", help="SQLAlchemy URL for the run")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--child", action="store_true", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["USE_MOCK_SERVICES"] = "true" if args.mock else "false"
+    os.environ["SEED_ON_STARTUP"] = "true" if args.seed else "false"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["PASSWORD_HASH_WORKERS"] = "0"
+    os.environ["TTS_CACHE_DIR"] = ""
+
+
+def fill(users: int, vocabulary_items: int):
+    """Bulk-insert rows straight into the tables; the app's own seeding is what's being timed."""
+    from uuid import uuid4
+    from sqlalchemy import insert
+    from app.database.database import engine, init_db
+    from app.models import User
+    from app.models.vocabulary import VocabularyItem, VocabularyList, VocabularyListItem
+
+    asyncio.run(init_db())
+
+    with engine.begin() as conn:
+        teacher_id = uuid4()
+        conn.execute(insert(User), [
+            {"id": teacher_id, "email": "teacher@example.com", "password_hash": "x",
+             "first_name": "Startup", "last_name": "Teacher", "role": "teacher"},
+        ])
+        conn.execute(insert(User), [
+            {"id": uuid4(), "email": f"student-{i}@example.com", "password_hash": "x",
+             "first_name": "Startup", "last_name": f"Student {i}", "teacher_id": teacher_id}
+            for i in range(users - 1)
+        ])
+
+        list_id = uuid4()
+        conn.execute(insert(VocabularyList), [
+            {"id": list_id, "title": "Startup", "target_language": "spanish", "teacher_id": teacher_id},
+        ])
+        item_ids = [uuid4() for _ in range(vocabulary_items)]
+        conn.execute(insert(VocabularyItem), [
+            {"id": item_id, "word": f"palabra {i}", "translation": f"word {i}"}
+            for i, item_id in enumerate(item_ids)
+        ])
+        conn.execute(insert(VocabularyListItem), [
+            {"vocabulary_list_id": list_id, "vocabulary_item_id": item_id} for item_id in item_ids
+        ])
+
+
+async def start_and_stop(app) -> float:
+    start = time.perf_counter()
+    async with app.router.lifespan_context(app):
+        elapsed = time.perf_counter() - start
+    return elapsed
+
+
+def child():
+    """One cold start; prints its timings as JSON."""
+    start = time.perf_counter()
+    from app.main import app
+    import_seconds = time.perf_counter() - start
+    sdks_imported = sorted(name for name in ("anthropic", "openai") if name in sys.modules)
+
+    startup_seconds = asyncio.run(start_and_stop(app))
+    print(json.dumps({
+        "import_seconds": import_seconds,
+        "startup_seconds": startup_seconds,
+        "sdks_imported": sdks_imported,
+    }))
+
+
+def summarize(values: list[float]) -> dict:
+    return {"median": round(statistics.median(values), 4), "max": round(max(values), 4)}
+
+
+def run(args) -> dict:
+    if args.database_url.startswith("sqlite:///"):
+        path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+
+    start = time.perf_counter()
+    fill(args.users, args.vocabulary_items)
+    fill_seconds = time.perf_counter() - start
+
+    runs = []
+    for _ in range(args.runs):
+        # Output before the last line is the app's own startup logging
+        result = subprocess.run(
+            [sys.executable, "-m", "benchmarks.startup", "--child"],
+            env=os.environ, capture_output=True, text=True, check=True,
+        )
+        runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+
+    return {
+        "config": {
+            "users": args.users,
+            "vocabulary_items": args.vocabulary_items,
+            "runs": args.runs,
+            "seed_on_startup": args.seed,
+            "mock_services": args.mock,
+            "database": args.database_url.split(":", 1)[0],
+        },
+        "fill_seconds": round(fill_seconds, 3),
+        "import": summarize([run["import_seconds"] for run in runs]),
+        "startup": summarize([run["startup_seconds"] for run in runs]),
+        "total": summarize([run["import_seconds"] + run["startup_seconds"] for run in runs]),
+        "sdks_imported": sorted({name for run in runs for name in run["sdks_imported"]}),
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.child:
+        # The parent has already set up the environment
+        child()
+        return
+
+    configure_environment(args)
+
+    report = run(args)
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
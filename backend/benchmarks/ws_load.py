@@ -0,0 +1,265 @@
+"""
+Load test for /ws/conversation with simulated students.
+
+Starts the app in-process on mock services, creates one assigned session per
+simulated student, then has every student connect at once and replay
+config -> audio x k -> end_session. Prints a JSON report with throughput
+and p50/p95/p99 per pipeline stage so runs can be compared across commits.
+
+Runs fully offline. The default database is an embedded SQLite file; pass
+--database-url to point at a local Postgres instead.
+
+Usage (from backend/):
+    python -m benchmarks.ws_load --students 50 --turns 5 \\
+        --stt-latency lognormal:-0.7,0.3 --llm-latency uniform:0.4,0.9 --tts-latency fixed:0.3
+"""
+import argparse
+import asyncio
+import base64
+import json
+import os
+import socket
+import time
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", type=int, default=20, help="concurrent WebSocket clients")
+    parser.add_argument("--turns", type=int, default=3, help="audio turns per student")
+    parser.add_argument("--stream", action="store_true", help="use sentence-streamed replies")
+    parser.add_argument("--binary", action="store_true", help="use binary audio frames")
+    parser.add_argument("--audio-bytes", type=int, default=32_000, help="size of each simulated recording")
+    parser.add_argument("--stt-latency", default="", help="mock STT latency spec, e.g. lognormal:-0.7,0.3")
+    parser.add_argument("--llm-latency", default="", help="mock LLM latency spec, e.g. uniform:0.4,0.9")
+    parser.add_argument("--tts-latency", default="", help="mock TTS latency spec, e.g. fixed:0.3")
+    parser.add_argument("--scoring-latency", default="", help="mock scoring latency spec")
+    parser.add_argument("--database-url", default="sqlite:///./bench.db", help="SQLAlchemy URL for the run")
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    return parser.parse_args(argv)
+
+
+def configure_environment(args):
+    # Settings are read at import time, so this must run before importing the app
+    os.environ["USE_MOCK_SERVICES"] = "true"
+    os.environ["DATABASE_URL"] = args.database_url
+    os.environ["MOCK_STT_LATENCY"] = args.stt_latency
+    os.environ["MOCK_LLM_LATENCY"] = args.llm_latency
+    os.environ["MOCK_TTS_LATENCY"] = args.tts_latency
+    os.environ["MOCK_SCORING_LATENCY"] = args.scoring_latency
+    os.environ["TTS_CACHE_DIR"] = ""
+
+    if args.database_url.startswith("sqlite:///"):
+        path = args.database_url[len("sqlite:///"):]
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def summarize(samples: dict[str, list[float]]) -> dict:
+    from app.utils.metrics import percentile
+
+    summary = {}
+    for stage, values in samples.items():
+        if not values:
+            continue
+        ordered = sorted(values)
+        summary[stage] = {
+            "count": len(ordered),
+            "p50": round(percentile(ordered, 50), 4),
+            "p95": round(percentile(ordered, 95), 4),
+            "p99": round(percentile(ordered, 99), 4),
+            "max": round(ordered[-1], 4),
+        }
+    return summary
+
+
+def create_sessions(count: int) -> tuple[dict, list[str]]:
+    """Create a teacher, an exam and one assigned session per simulated student."""
+    from sqlmodel import Session
+    from app.database.database import engine
+    from app.models import User, Exam, ConversationSession
+    from app.services.conversation_engine import ConversationEngine
+
+    with Session(engine) as db:
+        teacher = User(
+            email=f"bench-teacher-{time.time_ns()}@example.com",
+            password_hash="!",
+            first_name="Bench",
+            last_name="Teacher",
+            role="teacher",
+        )
+        db.add(teacher)
+        db.flush()
+
+        exam = Exam(
+            title="Load test",
+            target_language="spanish",
+            topic="ordering food at a restaurant",
+            difficulty_level="beginner",
+            conversation_prompt=ConversationEngine().build_system_prompt(
+                target_language="spanish",
+                student_level="beginner",
+                vocabulary=[],
+                topic="ordering food at a restaurant",
+                verb_tenses=[],
+            ),
+            created_by_id=teacher.id,
+        )
+        db.add(exam)
+        db.flush()
+
+        sessions = []
+        for i in range(count):
+            student = User(
+                email=f"bench-student-{i}-{time.time_ns()}@example.com",
+                password_hash="!",
+                first_name="Bench",
+                last_name=f"Student {i}",
+                teacher_id=teacher.id,
+            )
+            db.add(student)
+            db.flush()
+            session = ConversationSession(exam_id=exam.id, student_id=student.id)
+            db.add(session)
+            sessions.append(session)
+
+        db.commit()
+        return {"conversation_prompt": exam.conversation_prompt}, [str(session.id) for session in sessions]
+
+
+async def receive_json(ws) -> dict:
+    while True:
+        message = await ws.recv()
+        if isinstance(message, str):
+            return json.loads(message)
+
+
+async def run_student(url: str, session_id: str, exam: dict, args, samples: dict[str, list[float]]):
+    import websockets
+
+    audio = os.urandom(args.audio_bytes)
+    reply_types = ("tutor_message_done",) if args.stream else ("tutor_message",)
+
+    start = time.perf_counter()
+    async with websockets.connect(url, max_size=None) as ws:
+        samples["connect"].append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        await ws.send(json.dumps({
+            "type": "config",
+            "id": session_id,
+            "exam": exam,
+            "targetLanguage": "spanish",
+            "stream": args.stream,
+            "binary_audio": args.binary,
+        }))
+        while (await receive_json(ws))["type"] != "tutor_message":
+            pass
+        samples["opening"].append(time.perf_counter() - start)
+
+        for _ in range(args.turns):
+            start = time.perf_counter()
+            if args.binary:
+                await ws.send(json.dumps({"type": "audio", "binary": True}))
+                await ws.send(audio)
+            else:
+                await ws.send(json.dumps({"type": "audio", "audio": base64.b64encode(audio).decode()}))
+
+            first_audio = None
+            while True:
+                message = await receive_json(ws)
+                now = time.perf_counter() - start
+                if message["type"] == "transcript":
+                    samples["transcript"].append(now)
+                elif message["type"] in ("tutor_audio_chunk", "tutor_message") and first_audio is None:
+                    first_audio = now
+                    samples["first_audio"].append(now)
+                elif message["type"] == "error":
+                    raise RuntimeError(message["message"])
+
+                if message["type"] in reply_types:
+                    samples["turn"].append(now)
+                    break
+
+        start = time.perf_counter()
+        await ws.send(json.dumps({"type": "end_session"}))
+        while True:
+            message = await receive_json(ws)
+            if message["type"] == "session_ended":
+                samples["end_session"].append(time.perf_counter() - start)
+            elif message["type"] == "session_score":
+                samples["score_push"].append(time.perf_counter() - start)
+                break
+
+
+async def run(args) -> dict:
+    import uvicorn
+    from app.main import app
+
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", ws_max_size=64 * 1024 * 1024))
+    server_task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+
+    exam, session_ids = await asyncio.to_thread(create_sessions, args.students)
+    samples: dict[str, list[float]] = {
+        stage: [] for stage in ("connect", "opening", "transcript", "first_audio", "turn", "end_session", "score_push")
+    }
+
+    url = f"ws://127.0.0.1:{port}/ws/conversation"
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(run_student(url, session_id, exam, args, samples) for session_id in session_ids),
+        return_exceptions=True,
+    )
+    elapsed = time.perf_counter() - start
+
+    server.should_exit = True
+    await server_task
+
+    errors = [repr(result) for result in results if isinstance(result, Exception)]
+    completed_turns = len(samples["turn"])
+
+    return {
+        "config": {
+            "students": args.students,
+            "turns": args.turns,
+            "stream": args.stream,
+            "binary": args.binary,
+            "audio_bytes": args.audio_bytes,
+            "stt_latency": args.stt_latency,
+            "llm_latency": args.llm_latency,
+            "tts_latency": args.tts_latency,
+            "scoring_latency": args.scoring_latency,
+            "database": args.database_url.split(":", 1)[0],
+        },
+        "elapsed_seconds": round(elapsed, 3),
+        "sessions_completed": args.students - len(errors),
+        "turns_completed": completed_turns,
+        "throughput": {
+            "turns_per_second": round(completed_turns / elapsed, 3) if elapsed else 0,
+            "sessions_per_second": round((args.students - len(errors)) / elapsed, 3) if elapsed else 0,
+        },
+        "stages": summarize(samples),
+        "errors": errors[:10],
+    }
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    configure_environment(args)
+
+    report = asyncio.run(run(args))
+    output = json.dumps(report, indent=2)
+    print(output)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,11 @@ from app.models.vocabulary import VocabularyList, VocabularyItem, VocabularyList
 from app.models.conversation_session import ConversationSession
 from app.models.conversation_turn import ConversationTurn
 from app.models.session_score import SessionScore
+from app.models.scoring_job import ScoringJob
+from app.models.session_metrics import SessionMetrics
+from app.models.exam_opening import ExamOpening
+from app.models.schema_migration import SchemaMigration
+from app.database.migrations import run_migrations
 
 response = input("This will DELETE ALL DATA. Are you sure? (yes/no): ")
 if response.lower() != "yes":
@@ -28,6 +33,8 @@ with engine.connect() as conn:
 
 print("Creating all tables...")
 SQLModel.metadata.create_all(engine)
+with engine.connect() as conn:
+    run_migrations(conn)
 
 print("Done! Database has been reset.")
 
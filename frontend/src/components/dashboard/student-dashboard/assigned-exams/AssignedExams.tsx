@@ -4,7 +4,7 @@ import { Flex, Text, Spinner, Separator } from "@chakra-ui/react";
 import ExamCard from "./ExamCard";
 import {
   getMyAssignments,
-  type StudentAssignmentResponse,
+  type StudentAssignmentSummaryResponse,
 } from "@/utils/apiCalls";
 
 interface AssignedExamsProps {
@@ -13,7 +13,7 @@ interface AssignedExamsProps {
 
 export default function AssignedExams({ mode }: AssignedExamsProps) {
   const [assignmentData, setAssignmentData] = useState<
-    StudentAssignmentResponse[]
+    StudentAssignmentSummaryResponse[]
   >([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
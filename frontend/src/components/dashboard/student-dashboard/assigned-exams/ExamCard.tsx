@@ -1,3 +1,4 @@
+import { useState } from "react";
 import {
   Collapsible,
   Button,
@@ -10,17 +11,35 @@ import { NavLink } from "react-router";
 
 import VocabularyTable from "@/components/common/VocabularyTable";
 import { LuChevronRight } from "react-icons/lu";
-import { type StudentAssignmentResponse } from "@/utils/apiCalls";
+import {
+  getExamData,
+  type StudentAssignmentSummaryResponse,
+  type VocabularyListResponse,
+} from "@/utils/apiCalls";
 import StudentExamScoreCard from "./StudentExamScoreCard";
 import ExamCardItem from "@/components/common/ExamCardItem";
 
 interface ExamCardProps {
-  examData: StudentAssignmentResponse;
+  examData: StudentAssignmentSummaryResponse;
 }
 
 export default function ExamCard({ examData }: ExamCardProps) {
+  // The assignments list only has exam summaries; fetch the vocabulary when the card is opened
+  const [vocabularyList, setVocabularyList] =
+    useState<VocabularyListResponse | null>(null);
+
+  const handleOpenChange = async ({ open }: { open: boolean }) => {
+    if (!open || vocabularyList || !examData.exam.vocabulary_list) return;
+    try {
+      const detail = await getExamData(examData.id);
+      setVocabularyList(detail.exam.vocabulary_list);
+    } catch (err) {
+      console.error(err);
+    }
+  };
+
   return (
-    <Collapsible.Root ml={2}>
+    <Collapsible.Root ml={2} onOpenChange={handleOpenChange}>
       <Collapsible.Trigger
         paddingY="3"
         display="flex"
@@ -55,7 +74,7 @@ export default function ExamCard({ examData }: ExamCardProps) {
                 Target Vocabulary
               </Text>
               <VocabularyTable
-                vocabularyListData={examData.exam.vocabulary_list}
+                vocabularyListData={vocabularyList}
               />
               <ExamCardItem title="Status" data={examData.status} />
               <ExamCardItem title="Due Date" data={examData.due_date} />
@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { type AxiosResponse } from 'axios';
 import { getErrorMessage } from "./helperFunctions";
 
 
@@ -30,6 +30,11 @@ export interface ExamResponse {
     created_at: string;
 }
 
+// List views get this summary; the prompt and vocabulary items come from the detail endpoints
+export interface ExamSummaryResponse extends Omit<ExamResponse, "conversation_prompt" | "vocabulary_list"> {
+    vocabulary_list: VocabularyListSummaryResponse | null;
+}
+
 export interface SessionScoreResponse {
     id: string;
     vocabulary_usage_score: number;
@@ -77,7 +82,7 @@ export interface ConversationSession {
 }
 
 export interface DashboardExamResponse {
-    exam: ExamResponse;
+    exam: ExamSummaryResponse;
     total_assigned: number;
     pending: number;
     in_progress: number;
@@ -155,9 +160,13 @@ export interface StudentAssignmentResponse {
     session_score: SessionScoreResponse | null;
 } 
 
-export const getMyAssignments = async (): Promise<StudentAssignmentResponse[]> => {
+export interface StudentAssignmentSummaryResponse extends Omit<StudentAssignmentResponse, "exam"> {
+    exam: ExamSummaryResponse;
+}
+
+export const getMyAssignments = async (): Promise<StudentAssignmentSummaryResponse[]> => {
     try{
-        const res = await axios.get<StudentAssignmentResponse[]>(
+        const res = await axios.get<StudentAssignmentSummaryResponse[]>(
             `${import.meta.env.VITE_API_BASE_URL}exams/assignments`,
             {withCredentials: true}
         )
@@ -211,6 +220,13 @@ export interface VocabularyListCreate{
     items: VocabularyItemCreate[];
 }
 
+export interface VocabularyListSummaryResponse{
+    id: string;
+    title: string;
+    description: string | null;
+    target_language: string;
+}
+
 export interface VocabularyListResponse{
     id: string | null;
     title: string;
@@ -253,13 +269,26 @@ export const createVocabularyList = async(vocabListData: VocabularyListCreate):
     }
 }
 
+export interface Page<T>{
+    items: T[];
+    next_cursor: string | null;
+    limit: number;
+}
+
 export const getCreatedVocabularyLists = async(): Promise<VocabularyListResponse[]> => {
     try{
-        const res = await axios.get<VocabularyListResponse[]>(
-            `${import.meta.env.VITE_API_BASE_URL}vocabulary-lists`,
-            {withCredentials: true}
-        )
-        return res.data;
+        // The endpoint is paginated; follow next_cursor until every list is loaded
+        const lists: VocabularyListResponse[] = [];
+        let cursor: string | null = null;
+        do {
+            const res: AxiosResponse<Page<VocabularyListResponse>> = await axios.get<Page<VocabularyListResponse>>(
+                `${import.meta.env.VITE_API_BASE_URL}vocabulary-lists`,
+                {withCredentials: true, params: cursor ? {cursor} : {}}
+            )
+            lists.push(...res.data.items);
+            cursor = res.data.next_cursor;
+        } while (cursor);
+        return lists;
     }catch(err){
         throw new Error(getErrorMessage(err));
     }